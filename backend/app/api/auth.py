@@ -1,26 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 import uuid
-import json
 
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.http_cache import invalidate
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, UserUpdate
-from app.services.auth import get_password_hash, verify_password, create_access_token, get_current_user
+from app.services.auth import (
+    get_password_hash_async, verify_password_async, password_needs_rehash,
+    create_access_token, get_current_user, invalidate_cached_user
+)
+from app.services.geo import set_location
+from app.services.interests import set_user_interests, interest_index
+from app.tasks import index_user_task
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# register and login stay async so password hashing can wait on the bounded
+# password pool without holding a threadpool worker; their few queries run
+# through run_in_threadpool instead.
+def _find_existing_user(db: Session, email: str, username: str):
+    return db.query(User).filter(
+        (User.email == email) | (User.username == username)
+    ).first()
+
+def _save_user(db: Session, db_user: User, interests: List[str]) -> User:
+    set_location(db, db_user, db_user.latitude, db_user.longitude)
+    db.add(db_user)
+    db.flush()
+    normalized = set_user_interests(db, db_user.id, interests)
+    db.commit()
+    index_user_task.delay(db_user.id)
+    interest_index.update(db_user.id, normalized)
+    invalidate("users")
+    db.refresh(db_user)
+    return db_user
+
+def _find_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
 @router.post("/register", response_model=UserResponse)
 async def register(user: UserCreate, db: Session = Depends(get_db)):
     # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user.email) | (User.username == user.username)
-    ).first()
+    existing_user = await run_in_threadpool(_find_existing_user, db, user.email, user.username)
     
     if existing_user:
         raise HTTPException(
@@ -35,52 +63,65 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         username=user.username,
         first_name=user.first_name,
         last_name=user.last_name,
-        password_hash=get_password_hash(user.password),
+        password_hash=await get_password_hash_async(user.password),
         occupation=user.occupation,
-        interests=json.dumps(user.interests),
+        interests=user.interests,
         location=user.location,
+        latitude=user.latitude,
+        longitude=user.longitude,
         bio=user.bio
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    return db_user
+    return await run_in_threadpool(_save_user, db, db_user, user.interests)
 
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(_find_user_by_email, db, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes made with an older BCRYPT_ROUNDS
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(form_data.password)
+        await run_in_threadpool(db.commit)
+    
     access_token = create_access_token(data={"sub": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.put("/profile", response_model=UserResponse)
-async def update_profile(
+def update_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     update_data = user_update.dict(exclude_unset=True)
     
+    interests = None
     if "interests" in update_data:
-        update_data["interests"] = json.dumps(update_data["interests"])
+        update_data["interests"] = update_data["interests"] or []
+        interests = set_user_interests(db, current_user.id, update_data["interests"])
     
+    latitude, longitude = update_data.pop("latitude", None), update_data.pop("longitude", None)
     for field, value in update_data.items():
         setattr(current_user, field, value)
+    if "location" in update_data or latitude is not None:
+        set_location(db, current_user, latitude, longitude)
     
     db.commit()
+    index_user_task.delay(current_user.id)
+    invalidate_cached_user(current_user.id)
+    invalidate("users", current_user.id)
+    if interests is not None:
+        interest_index.update(current_user.id, interests)
     db.refresh(current_user)
     
     return current_user
@@ -1,20 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import uuid
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.http_cache import invalidate
 from app.models.user import User
-from app.models.event import Event, EventAttendee
+from app.models.event import Event
 from app.schemas.event import EventCreate, EventResponse, EventAttendeeCreate, EventAttendeeResponse
 from app.services.auth import get_current_user
+from app.services.events import REQUESTABLE_STATUSES, set_attendance
+from app.services.geo import MAX_RADIUS_KM, parse_near, set_location, within_radius
+from app.services.notifications import notify
 
 router = APIRouter()
 
 @router.post("/", response_model=EventResponse)
-async def create_event(
+def create_event(
     event: EventCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -29,22 +34,26 @@ async def create_event(
         image_url=event.image_url,
         organizer_id=current_user.id
     )
+    set_location(db, db_event, event.latitude, event.longitude)
     
     db.add(db_event)
     db.commit()
+    invalidate("events")
     db.refresh(db_event)
     
     return db_event
 
 @router.get("/", response_model=List[EventResponse])
-async def get_events(
+def get_events(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     location: Optional[str] = None,
     occupation: Optional[str] = None,
-    db: Session = Depends(get_db)
+    near: Optional[str] = Query(None, description="lat,lon; results within radius_km, nearest first"),
+    radius_km: float = Query(25, gt=0, le=MAX_RADIUS_KM),
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(Event).filter(Event.date >= datetime.now())
+    query = db.query(Event).options(joinedload(Event.organizer)).filter(Event.date >= datetime.now())
     
     if location:
         query = query.filter(Event.location.ilike(f"%{location}%"))
@@ -52,46 +61,57 @@ async def get_events(
     if occupation:
         query = query.join(User, Event.organizer_id == User.id).filter(User.occupation == occupation)
     
+    if near:
+        try:
+            latitude, longitude = parse_near(near)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return within_radius(query, Event, latitude, longitude, radius_km, skip, limit)
+    
     events = query.order_by(Event.date).offset(skip).limit(limit).all()
     return events
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: str, db: Session = Depends(get_db)):
-    event = db.query(Event).filter(Event.id == event_id).first()
+def get_event(event_id: str, db: Session = Depends(get_read_db)):
+    event = db.query(Event).options(joinedload(Event.organizer)).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 @router.post("/{event_id}/attend", response_model=EventAttendeeResponse)
-async def attend_event(
+def attend_event(
     event_id: str,
     attendance: EventAttendeeCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    if attendance.status not in REQUESTABLE_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid attendance status")
+    
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+    organizer_id, event_title, actor_name = event.organizer_id, event.title, current_user.first_name
     
-    # Check if already attending
-    existing_attendance = db.query(EventAttendee).filter(
-        EventAttendee.event_id == event_id,
-        EventAttendee.user_id == current_user.id
-    ).first()
-    
-    if existing_attendance:
-        existing_attendance.status = attendance.status
+    attendee, previous_status, promoted = set_attendance(db, event_id, current_user.id, attendance.status)
+    promoted_ids = [promoted_attendee.user_id for promoted_attendee in promoted]
+    try:
         db.commit()
-        db.refresh(existing_attendance)
-        return existing_attendance
-    else:
-        attendee = EventAttendee(
-            id=str(uuid.uuid4()),
-            event_id=event_id,
-            user_id=current_user.id,
-            status=attendance.status
+    except IntegrityError:
+        # A concurrent request created this user's row first
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Attendance already recorded")
+    invalidate("events", event_id)
+    
+    if previous_status is None and attendee.status != "not_attending" and organizer_id != current_user.id:
+        notify(
+            organizer_id, "event", "New attendee", f"{actor_name} is going to {event_title}",
+            data={"event_id": event_id, "status": attendee.status}
         )
-        db.add(attendee)
-        db.commit()
-        db.refresh(attendee)
-        return attendee
+    for user_id in promoted_ids:
+        notify(
+            user_id, "event", "You're off the waitlist", f"A spot opened up at {event_title}",
+            data={"event_id": event_id, "status": "attending"}
+        )
+    db.refresh(attendee)
+    return attendee
@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import uuid
-import json
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.http_cache import invalidate
 from app.models.user import User
 from app.models.job import Job, JobApplication
-from app.schemas.job import JobCreate, JobResponse, JobApplicationCreate, JobApplicationResponse
+from app.schemas.job import (
+    JobCreate, JobResponse, JobActiveUpdate, JobSearchResponse, JobApplicationCreate, JobApplicationResponse
+)
 from app.services.auth import get_current_user
+from app.services.geo import MAX_RADIUS_KM, parse_near, set_location, within_radius
+from app.services.job_facets import adjust_job_facets, job_facet_counts, matched_facet_counts
+from app.services.notifications import notify
+from app.services.search import index_job, job_matches
 
 router = APIRouter()
 
 @router.post("/", response_model=JobResponse)
-async def create_job(
+def create_job(
     job: JobCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -27,26 +35,24 @@ async def create_job(
         location=job.location,
         type=job.type,
         salary=job.salary,
-        requirements=json.dumps(job.requirements) if job.requirements else None,
-        benefits=json.dumps(job.benefits) if job.benefits else None,
-        poster_id=current_user.id
+        requirements=job.requirements or None,
+        benefits=job.benefits or None,
+        poster_id=current_user.id,
+        poster_occupation=current_user.occupation
     )
+    set_location(db, db_job, job.latitude, job.longitude)
     
     db.add(db_job)
+    db.flush()
+    index_job(db, db_job)
+    adjust_job_facets(db, db_job, 1)
     db.commit()
+    invalidate("jobs")
     db.refresh(db_job)
     
     return db_job
 
-@router.get("/", response_model=List[JobResponse])
-async def get_jobs(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
-    location: Optional[str] = None,
-    type: Optional[str] = None,
-    occupation: Optional[str] = None,
-    db: Session = Depends(get_db)
-):
+def _active_jobs(db: Session, location: Optional[str], type: Optional[str], occupation: Optional[str]):
     query = db.query(Job).filter(Job.is_active == True)
     
     if location:
@@ -58,18 +64,98 @@ async def get_jobs(
     if occupation:
         query = query.join(User, Job.poster_id == User.id).filter(User.occupation == occupation)
     
+    return query
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    location: Optional[str] = None,
+    type: Optional[str] = None,
+    occupation: Optional[str] = None,
+    near: Optional[str] = Query(None, description="lat,lon; results within radius_km, nearest first"),
+    radius_km: float = Query(25, gt=0, le=MAX_RADIUS_KM),
+    db: Session = Depends(get_read_db)
+):
+    query = _active_jobs(db, location, type, occupation).options(joinedload(Job.poster))
+    
+    if near:
+        try:
+            latitude, longitude = parse_near(near)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return within_radius(query, Job, latitude, longitude, radius_km, skip, limit)
+    
     jobs = query.order_by(desc(Job.created_at)).offset(skip).limit(limit).all()
     return jobs
 
+@router.get("/search", response_model=JobSearchResponse)
+def search_jobs(
+    q: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    location: Optional[str] = None,
+    type: Optional[str] = None,
+    occupation: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Active jobs matching q and the filters, best match first, with facet counts.
+
+    Without q or filters the facets count every active job ("all_active");
+    otherwise they count the best JOB_SEARCH_FACET_SCAN_LIMIT matches
+    ("matches"), as reported in facets_scope.
+    """
+    query = _active_jobs(db, location, type, occupation)
+    order = [desc(Job.created_at), desc(Job.id)]
+    
+    matches = job_matches(db, q) if q else None
+    if matches is not None:
+        query = query.join(matches, matches.c.job_id == Job.id)
+        order.insert(0, matches.c.rank)
+    
+    total = query.count()
+    jobs = query.options(joinedload(Job.poster)).order_by(*order).offset(skip).limit(limit).all()
+    if matches is None and not (location or type or occupation):
+        # The unfiltered board reads the maintained counts in job_facets
+        return {"jobs": jobs, "total": total, "facets": job_facet_counts(db), "facets_scope": "all_active"}
+    best_matches = query.with_entities(Job.id).order_by(*order).limit(settings.JOB_SEARCH_FACET_SCAN_LIMIT)
+    return {"jobs": jobs, "total": total, "facets": matched_facet_counts(db, best_matches), "facets_scope": "matches"}
+
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.id == job_id).first()
+def get_job(job_id: str, db: Session = Depends(get_read_db)):
+    job = db.query(Job).options(joinedload(Job.poster)).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
+@router.put("/{job_id}/active", response_model=JobResponse)
+def set_job_active(
+    job_id: str,
+    update: JobActiveUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    job = db.query(Job).options(joinedload(Job.poster)).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.poster_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the poster can change this job")
+    
+    # Conditional so concurrent toggles adjust the facet counts once
+    changed = db.query(Job).filter(
+        Job.id == job_id,
+        Job.is_active == (not update.is_active)
+    ).update({"is_active": update.is_active}, synchronize_session=False)
+    if changed:
+        adjust_job_facets(db, job, 1 if update.is_active else -1)
+    db.commit()
+    invalidate("jobs", job_id)
+    db.refresh(job)
+    
+    return job
+
 @router.post("/{job_id}/apply", response_model=JobApplicationResponse)
-async def apply_for_job(
+def apply_for_job(
     job_id: str,
     application: JobApplicationCreate,
     current_user: User = Depends(get_current_user),
@@ -100,7 +186,19 @@ async def apply_for_job(
     )
     
     db.add(db_application)
-    db.commit()
+    poster_id, job_title, actor_name = job.poster_id, job.title, current_user.first_name
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You have already applied for this job")
+    invalidate("jobs", job_id)
+    
+    if poster_id != db_application.user_id:
+        notify(
+            poster_id, "job", "New application", f"{actor_name} applied for {job_title}",
+            data={"job_id": job_id, "application_id": db_application.id}
+        )
     db.refresh(db_application)
     
     return db_application
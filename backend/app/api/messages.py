@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, or_
-from typing import List
+from typing import List, Optional
 import uuid
 
 from app.core.database import get_db
+from app.core.pagination import encode_cursor, decode_cursor, keyset_before, keyset_after
 from app.models.user import User
 from app.models.message import Message
-from app.schemas.message import MessageCreate, MessageResponse, ConversationResponse
+from app.models.conversation import Conversation
+from app.schemas.message import (
+    MessageCreate, MessageResponse, ConversationResponse, ReadReceiptCreate, ReadReceiptResponse
+)
 from app.services.auth import get_current_user
+from app.services.conversations import record_message, advance_read_watermark
+from app.services.realtime import publish
 
 router = APIRouter()
 
 @router.post("/", response_model=MessageResponse)
-async def send_message(
+def send_message(
     message: MessageCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -31,67 +37,157 @@ async def send_message(
     )
     
     db.add(db_message)
+    db.flush()
+    record_message(db, db_message)
     db.commit()
     db.refresh(db_message)
     
+    # Push to both sides so the sender's other devices update too
+    payload = MessageResponse.model_validate(db_message).model_dump(mode="json")
+    publish(db_message.receiver_id, "message", payload)
+    publish(db_message.sender_id, "message", payload)
+    
     return db_message
 
 @router.get("/conversations", response_model=List[ConversationResponse])
-async def get_conversations(
+def get_conversations(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Get all messages where user is sender or receiver
-    messages = db.query(Message).filter(
-        or_(
-            Message.sender_id == current_user.id,
-            Message.receiver_id == current_user.id
-        )
-    ).order_by(desc(Message.created_at)).all()
-    
-    # Group by conversation partner
-    conversations = {}
-    for message in messages:
-        partner_id = message.sender_id if message.sender_id != current_user.id else message.receiver_id
-        if partner_id not in conversations:
-            partner = db.query(User).filter(User.id == partner_id).first()
-            conversations[partner_id] = {
-                "user": partner,
-                "last_message": message,
-                "unread_count": 0
-            }
-        
-        if message.receiver_id == current_user.id and not message.is_read:
-            conversations[partner_id]["unread_count"] += 1
-    
-    return list(conversations.values())
+    conversations = db.query(Conversation).options(
+        joinedload(Conversation.partner),
+        joinedload(Conversation.last_message).joinedload(Message.sender),
+        joinedload(Conversation.last_message).joinedload(Message.receiver)
+    ).filter(
+        Conversation.user_id == current_user.id
+    ).order_by(desc(Conversation.last_message_at)).offset(skip).limit(limit).all()
+    
+    return [
+        {
+            "user": conversation.partner,
+            "last_message": conversation.last_message,
+            "unread_count": conversation.unread_count
+        }
+        for conversation in conversations
+    ]
+
+def _thread_filter(user_id: str, partner_id: str):
+    return or_(
+        (Message.sender_id == user_id) & (Message.receiver_id == partner_id),
+        (Message.sender_id == partner_id) & (Message.receiver_id == user_id)
+    )
+
+def _parse_cursor(cursor: str):
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 @router.get("/{user_id}", response_model=List[MessageResponse])
-async def get_messages(
+def get_messages(
     user_id: str,
+    response: Response,
+    before: Optional[str] = Query(None, description="Cursor: messages older than this position"),
+    after: Optional[str] = Query(None, description="Cursor: messages newer than this position"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    
     # Check if user exists
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    messages = db.query(Message).filter(
-        or_(
-            (Message.sender_id == current_user.id) & (Message.receiver_id == user_id),
-            (Message.sender_id == user_id) & (Message.receiver_id == current_user.id)
+    dialect_name = db.get_bind().dialect.name
+    query = db.query(Message).options(
+        joinedload(Message.sender),
+        joinedload(Message.receiver)
+    ).filter(_thread_filter(current_user.id, user_id))
+    
+    # Fetch one extra row to learn whether the page continues
+    if after:
+        query = query.filter(keyset_after(Message.created_at, Message.id, _parse_cursor(after), dialect_name))
+        rows = query.order_by(Message.created_at, Message.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        messages = rows[:limit]
+        older_exist = bool(messages)
+    else:
+        query = query.order_by(desc(Message.created_at), desc(Message.id))
+        if before:
+            query = query.filter(keyset_before(Message.created_at, Message.id, _parse_cursor(before), dialect_name))
+        else:
+            query = query.offset(skip)
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        messages = list(reversed(rows[:limit]))
+        older_exist = has_more
+    
+    # Cursors for infinite scroll in both directions; X-After-Cursor is always
+    # set so a client can poll for newer messages after reconnecting
+    if messages:
+        if older_exist:
+            response.headers["X-Before-Cursor"] = encode_cursor(messages[0].created_at, messages[0].id)
+        response.headers["X-After-Cursor"] = encode_cursor(messages[-1].created_at, messages[-1].id)
+    
+    # Read state comes from both sides' watermarks rather than per-row flags
+    watermarks = {
+        conversation.user_id: (conversation.last_read_at, conversation.last_read_message_id)
+        for conversation in db.query(Conversation).filter(
+            or_(
+                (Conversation.user_id == current_user.id) & (Conversation.partner_id == user_id),
+                (Conversation.user_id == user_id) & (Conversation.partner_id == current_user.id)
+            )
         )
-    ).order_by(desc(Message.created_at)).offset(skip).limit(limit).all()
-    
-    # Mark messages as read
-    db.query(Message).filter(
-        Message.sender_id == user_id,
-        Message.receiver_id == current_user.id,
-        Message.is_read == False
-    ).update({"is_read": True})
+    }
+    
+    def is_read(message: Message) -> bool:
+        watermark = watermarks.get(message.receiver_id)
+        return bool(watermark and watermark[0] is not None and (message.created_at, message.id) <= watermark)
+    
+    return [
+        MessageResponse.model_validate(message).model_copy(update={"is_read": is_read(message)})
+        for message in messages
+    ]
+
+@router.post("/{user_id}/read", response_model=ReadReceiptResponse)
+def mark_read(
+    user_id: str,
+    receipt: ReadReceiptCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    conversation = db.query(Conversation).filter(
+        Conversation.user_id == current_user.id,
+        Conversation.partner_id == user_id
+    ).first()
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    thread = db.query(Message.id).filter(_thread_filter(current_user.id, user_id))
+    if receipt.message_id:
+        target = thread.filter(Message.id == receipt.message_id).first()
+    else:
+        target = thread.order_by(desc(Message.created_at), desc(Message.id)).first()
+    if not target:
+        raise HTTPException(status_code=404, detail="Message not found")
+    
+    advanced = advance_read_watermark(db, current_user.id, user_id, target.id)
     db.commit()
     
-    return list(reversed(messages))
+    db.refresh(conversation)
+    if advanced:
+        # Read receipt for the partner's open clients
+        publish(user_id, "read", {"user_id": current_user.id, "message_id": conversation.last_read_message_id})
+    
+    return {
+        "partner_id": user_id,
+        "last_read_message_id": conversation.last_read_message_id,
+        "last_read_at": conversation.last_read_at,
+        "unread_count": conversation.unread_count
+    }
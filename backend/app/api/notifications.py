@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
+import asyncio
 import uuid
 import json
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
 from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import NotificationResponse
-from app.services.auth import get_current_user
+from app.services.auth import get_current_user, get_user_id_from_token
+from app.services.notifications import adjust_unread_count, get_unread_count, publish_unread_count
+from app.services.realtime import registry
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NotificationResponse])
-async def get_notifications(
+def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     unread_only: bool = Query(False),
@@ -28,48 +35,110 @@ async def get_notifications(
     
     notifications = query.order_by(desc(Notification.created_at)).offset(skip).limit(limit).all()
     
-    # Get unread count
-    unread_count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).count()
+    # Unread count from the per-user counter rather than a COUNT(*)
+    response.headers["X-Unread-Count"] = str(get_unread_count(db, current_user.id))
     
     return notifications
 
+def _read_unread_count(user_id: str) -> int:
+    db = SessionLocal()
+    try:
+        return get_unread_count(db, user_id)
+    finally:
+        db.close()
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _unread_count_events(user_id: str):
+    # Subscribe before reading the count so no update slips in between
+    queue = registry.subscribe(user_id)
+    try:
+        initial = await run_in_threadpool(_read_unread_count, user_id)
+        last_sent = initial
+        yield _sse("unread_count", {"unread_count": initial, "delta": 0})
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event["type"] != "unread_count":
+                continue
+            
+            # Let a burst settle, then send only the latest count
+            await asyncio.sleep(settings.NOTIFICATION_STREAM_DEBOUNCE_MS / 1000)
+            latest = event["data"]["unread_count"]
+            while not queue.empty():
+                event = queue.get_nowait()
+                if event["type"] == "unread_count":
+                    latest = event["data"]["unread_count"]
+            
+            if latest != last_sent:
+                yield _sse("unread_count", {"unread_count": latest, "delta": latest - last_sent})
+                last_sent = latest
+    finally:
+        registry.unsubscribe(user_id, queue)
+
+@router.get("/stream")
+async def stream_unread_count(token: str):
+    # EventSource can't send headers, so the JWT comes as ?token=
+    user_id = get_user_id_from_token(token)
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    
+    return StreamingResponse(
+        _unread_count_events(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.put("/{notification_id}/read")
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    notification = db.query(Notification).filter(
+    # Conditional update so concurrent calls only decrement once
+    updated = db.query(Notification).filter(
         Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
+        Notification.user_id == current_user.id,
+        Notification.is_read == False
+    ).update({"is_read": True}, synchronize_session=False)
     
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
+    if not updated:
+        exists = db.query(Notification.id).filter(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Notification not found")
+        return {"message": "Notification marked as read"}
     
-    notification.is_read = True
+    adjust_unread_count(db, current_user.id, -updated)
     db.commit()
+    publish_unread_count(db, current_user.id)
     
     return {"message": "Notification marked as read"}
 
 @router.put("/read-all")
-async def mark_all_notifications_as_read(
+def mark_all_notifications_as_read(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    db.query(Notification).filter(
+    updated = db.query(Notification).filter(
         Notification.user_id == current_user.id,
         Notification.is_read == False
-    ).update({"is_read": True})
+    ).update({"is_read": True}, synchronize_session=False)
+    adjust_unread_count(db, current_user.id, -updated)
     db.commit()
+    if updated:
+        publish_unread_count(db, current_user.id)
     
     return {"message": "All notifications marked as read"}
 
 @router.delete("/{notification_id}")
-async def delete_notification(
+def delete_notification(
     notification_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -82,7 +151,12 @@ async def delete_notification(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
+    was_unread = not notification.is_read
     db.delete(notification)
+    if was_unread:
+        adjust_unread_count(db, current_user.id, -1)
     db.commit()
+    if was_unread:
+        publish_unread_count(db, current_user.id)
     
     return {"message": "Notification deleted"}
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import uuid
 import json
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import encode_cursor, decode_cursor, keyset_before
+from app.core.http_cache import invalidate
 from app.models.user import User
 from app.models.post import Post, Comment, Like
 from app.schemas.post import PostCreate, PostResponse, CommentCreate, CommentResponse
 from app.services.auth import get_current_user
+from app.services.timeline import read_timeline
+from app.tasks import fan_out_post_task
+from app.services.notifications import notify
 
 router = APIRouter()
 
 @router.post("/", response_model=PostResponse)
-async def create_post(
+def create_post(
     post: PostCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -28,21 +34,24 @@ async def create_post(
     
     db.add(db_post)
     db.commit()
-    db.refresh(db_post)
+    invalidate("posts")
+    fan_out_post_task.delay(db_post.id, idempotency_key=db_post.id)
     
     # Get post with author info
-    post_with_author = db.query(Post).filter(Post.id == db_post.id).first()
+    post_with_author = db.query(Post).options(joinedload(Post.author)).filter(Post.id == db_post.id).first()
     return post_with_author
 
 @router.get("/", response_model=List[PostResponse])
-async def get_posts(
+def get_posts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     occupation: Optional[str] = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    query = db.query(Post)
+    query = db.query(Post).options(joinedload(Post.author))
     
     if occupation or location:
         query = query.join(User, Post.author_id == User.id)
@@ -51,18 +60,53 @@ async def get_posts(
         if location:
             query = query.filter(User.location.ilike(f"%{location}%"))
     
-    posts = query.order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
+    query = query.order_by(desc(Post.created_at), desc(Post.id))
+    
+    # Cursor mode seeks past the last seen post; skip is kept for older clients
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(keyset_before(Post.created_at, Post.id, position, db.get_bind().dialect.name))
+    else:
+        query = query.offset(skip)
+    
+    posts = query.limit(limit + 1).all()
+    if len(posts) > limit:
+        posts = posts[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(posts[-1].created_at, posts[-1].id)
+    return posts
+
+@router.get("/timeline", response_model=List[PostResponse])
+def get_timeline(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    posts, has_more = read_timeline(db, current_user, limit, position)
+    if has_more and posts:
+        response.headers["X-Next-Cursor"] = encode_cursor(posts[-1].created_at, posts[-1].id)
     return posts
 
 @router.get("/{post_id}", response_model=PostResponse)
-async def get_post(post_id: str, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(Post.id == post_id).first()
+def get_post(post_id: str, db: Session = Depends(get_read_db)):
+    post = db.query(Post).options(joinedload(Post.author)).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
 
 @router.post("/{post_id}/like")
-async def like_post(
+def like_post(
     post_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -77,9 +121,14 @@ async def like_post(
         Like.user_id == current_user.id
     ).first()
     
+    # Counters are updated in SQL so concurrent likes don't overwrite each other
     if existing_like:
         db.delete(existing_like)
+        db.query(Post).filter(Post.id == post_id).update(
+            {Post.likes_count: Post.likes_count - 1}, synchronize_session=False
+        )
         db.commit()
+        invalidate("posts", post_id)
         return {"message": "Post unliked", "liked": False}
     else:
         like = Like(
@@ -88,11 +137,28 @@ async def like_post(
             user_id=current_user.id
         )
         db.add(like)
-        db.commit()
+        db.query(Post).filter(Post.id == post_id).update(
+            {Post.likes_count: Post.likes_count + 1}, synchronize_session=False
+        )
+        author_id, actor_name = post.author_id, current_user.first_name
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request from the same user liked it first
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Post already liked")
+        invalidate("posts", post_id)
+        
+        if author_id != like.user_id:
+            notify(
+                author_id, "like", "New like", f"{actor_name} liked your post",
+                data={"post_id": post_id}, group_key=f"like:{post_id}",
+                actor_name=actor_name, actor_id=like.user_id
+            )
         return {"message": "Post liked", "liked": True}
 
 @router.post("/{post_id}/comments", response_model=CommentResponse)
-async def add_comment(
+def add_comment(
     post_id: str,
     comment: CommentCreate,
     current_user: User = Depends(get_current_user),
@@ -110,7 +176,19 @@ async def add_comment(
     )
     
     db.add(db_comment)
+    db.query(Post).filter(Post.id == post_id).update(
+        {Post.comments_count: Post.comments_count + 1}, synchronize_session=False
+    )
+    author_id, actor_id, actor_name = post.author_id, current_user.id, current_user.first_name
     db.commit()
-    db.refresh(db_comment)
+    invalidate("posts", post_id)
+    
+    if author_id != actor_id:
+        notify(
+            author_id, "comment", "New comment", f"{actor_name} commented on your post",
+            data={"post_id": post_id, "comment_id": db_comment.id}
+        )
     
-    return db_comment
+    # Get comment with author info
+    comment_with_author = db.query(Comment).options(joinedload(Comment.author)).filter(Comment.id == db_comment.id).first()
+    return comment_with_author
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.services.auth import get_user_id_from_token
+from app.services.realtime import registry
+
+router = APIRouter()
+
+@router.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket, token: str):
+    # Browsers can't set headers on WebSocket requests, so the JWT comes as ?token=
+    user_id = get_user_id_from_token(token)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    registry.add(user_id, websocket)
+    try:
+        # Server push only; incoming frames are just keepalives
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        registry.remove(user_id, websocket)
@@ -1,24 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
+from sqlalchemy import desc
 from typing import List, Optional
 import json
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, UserMatchResponse
 from app.services.auth import get_current_user
+from app.services.geo import MAX_RADIUS_KM, parse_near, within_radius
+from app.services.search import search_user_ids
+from app.services.interests import normalize_interests, users_with_interests, interest_index
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
-async def get_users(
+def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     occupation: Optional[str] = None,
     location: Optional[str] = None,
     interests: Optional[str] = None,
-    db: Session = Depends(get_db)
+    match: str = Query("all", pattern="^(any|all)$"),
+    near: Optional[str] = Query(None, description="lat,lon; results within radius_km, nearest first"),
+    radius_km: float = Query(25, gt=0, le=MAX_RADIUS_KM),
+    db: Session = Depends(get_read_db)
 ):
     query = db.query(User)
     
@@ -29,35 +35,61 @@ async def get_users(
         query = query.filter(User.location.ilike(f"%{location}%"))
     
     if interests:
-        interest_list = interests.split(",")
-        for interest in interest_list:
-            query = query.filter(User.interests.ilike(f"%{interest}%"))
+        interest_list = normalize_interests(interests.split(","))
+        if interest_list:
+            query = query.filter(User.id.in_(users_with_interests(interest_list, match)))
+    
+    if near:
+        try:
+            latitude, longitude = parse_near(near)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return within_radius(query, User, latitude, longitude, radius_km, skip, limit)
     
     users = query.order_by(desc(User.created_at)).offset(skip).limit(limit).all()
     return users
 
+# Declared before the /{user_id} routes, which would otherwise match /search/...
+@router.get("/search/{query}", response_model=List[UserResponse])
+def search_users(
+    query: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    # Ranked ids from the search index, then one lookup for the rows
+    user_ids = search_user_ids(db, query, skip, limit)
+    if not user_ids:
+        return []
+    
+    users_by_id = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids))}
+    return [users_by_id[user_id] for user_id in user_ids if user_id in users_by_id]
+
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: str, db: Session = Depends(get_db)):
+def get_user(user_id: str, db: Session = Depends(get_read_db)):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-@router.get("/search/{query}", response_model=List[UserResponse])
-async def search_users(
-    query: str,
-    skip: int = Query(0, ge=0),
+@router.get("/{user_id}/matches", response_model=List[UserMatchResponse])
+def get_user_matches(
+    user_id: str,
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    users = db.query(User).filter(
-        or_(
-            User.username.ilike(f"%{query}%"),
-            User.first_name.ilike(f"%{query}%"),
-            User.last_name.ilike(f"%{query}%"),
-            User.occupation.ilike(f"%{query}%"),
-            User.location.ilike(f"%{query}%")
-        )
-    ).order_by(desc(User.created_at)).offset(skip).limit(limit).all()
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    return users
+    # Users sharing the most interests, from the in-memory bitmap index
+    matches = interest_index.best_matches(db, user_id, limit)
+    if not matches:
+        return []
+    
+    users_by_id = {match.id: match for match in db.query(User).filter(User.id.in_([match_id for match_id, _ in matches]))}
+    return [
+        {"user": users_by_id[match_id], "shared_interests": shared}
+        for match_id, shared in matches
+        if match_id in users_by_id
+    ]
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+class RedisCache:
+    """Cache shared between workers through Redis; values must be JSON-serializable."""
+
+    def __init__(self, url: str, namespace: str, ttl: float):
+        import redis
+
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._prefix = f"trumpet:{namespace}:"
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self._prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl_ms = max(1, int((self.ttl if ttl is None else ttl) * 1000))
+        self._client.set(self._prefix + key, json.dumps(value), px=ttl_ms)
+
+    def delete(self, key: str):
+        self._client.delete(self._prefix + key)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=self._prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+def create_cache(namespace: str, maxsize: int, ttl: float):
+    """Use Redis when REDIS_URL is configured, otherwise an in-process LRU."""
+    if settings.REDIS_URL:
+        return RedisCache(settings.REDIS_URL, namespace, ttl)
+    return TTLCache(maxsize, ttl)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # Database
@@ -9,6 +9,29 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "trumpet-super-secret-key-2024"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    
+    # Read replicas (comma-separated URLs); reads stay on the primary when empty
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_SELECTION: str = "round_robin"  # or "least_connections"
+    READ_YOUR_WRITES_SECONDS: int = 5  # Route a user's reads to the primary this long after a write
+    
+    # Connection pool; sizes left unset are derived from DB_MAX_CONNECTIONS
+    # split across WEB_CONCURRENCY uvicorn workers
+    DB_MAX_CONNECTIONS: int = 20  # Budget for the whole deployment
+    WEB_CONCURRENCY: int = 1
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456
     
     # CORS
     FRONTEND_URL: str = "http://localhost:8080"
@@ -16,6 +39,42 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: Optional[str] = None
     
+    # Authenticated user cache
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    
+    # Public response cache
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_SIZE: int = 5000
+    RESPONSE_CACHE_MAX_AGE: int = 5  # Cache-Control max-age for clients
+    
+    # Notification writer
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_FLUSH_INTERVAL_MS: int = 200
+    NOTIFICATION_QUEUE_SIZE: int = 10000
+    NOTIFICATION_ENQUEUE_TIMEOUT_MS: int = 50  # Producers wait this long on a full queue before dropping
+    
+    # Notification badge stream
+    NOTIFICATION_STREAM_DEBOUNCE_MS: int = 500
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: int = 15
+    
+    # Matchmaking
+    INTEREST_INDEX_TTL_SECONDS: int = 300
+    
+    # Home timelines
+    TIMELINE_MAX_LENGTH: int = 500
+    TIMELINE_FANOUT_LIMIT: int = 5000  # Larger audiences are served on read
+    TIMELINE_TRIM_EVERY: int = 20  # Trim audiences' timelines on ~1 in N posts
+    
+    # Job search
+    JOB_SEARCH_FACET_SCAN_LIMIT: int = 1000  # Filtered facets count the best N matches
+    
+    # Background tasks
+    TASK_BACKEND: str = "inprocess"  # or "celery"
+    CELERY_BROKER_URL: Optional[str] = None  # Defaults to REDIS_URL
+    TASK_QUEUE_CONCURRENCY: Dict[str, int] = {"default": 2, "timeline": 2, "search": 1}
+    TASK_IDEMPOTENCY_TTL_SECONDS: int = 3600
+    
     class Config:
         env_file = ".env"
 
@@ -1,16 +1,208 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import JSON, create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from app.core.cache import create_cache
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def recreate(self):
+        # Pools are recreated on dispose(); keep counting from the same numbers
+        pool = super().recreate()
+        pool.checkouts, pool.wait_seconds = self.checkouts, self.wait_seconds
+        pool.max_wait_seconds, pool.timeouts = self.max_wait_seconds, self.timeouts
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+def _pool_sizes():
+    """Per-worker pool size and overflow that keep all workers within DB_MAX_CONNECTIONS."""
+    per_worker = max(2, settings.DB_MAX_CONNECTIONS // max(1, settings.WEB_CONCURRENCY))
+    pool_size = settings.DB_POOL_SIZE or max(1, per_worker // 2)
+    max_overflow = settings.DB_MAX_OVERFLOW
+    if max_overflow is None:
+        max_overflow = max(0, per_worker - pool_size)
+    return pool_size, max_overflow
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed during a write; busy_timeout makes writers
+    # queue for the lock instead of failing with "database is locked"
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+def create_db_engine(url: str):
+    """Engine with the configured pool, plus pragmas for SQLite files."""
+    database_url = make_url(url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection; keep the default pool
+        return create_engine(url)
+
+    pool_size, max_overflow = _pool_sizes()
+    db_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+    if database_url.get_backend_name() == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def pool_stats(db_engine=None) -> dict:
+    """Checkout counters for an engine's pool, for the metrics endpoint."""
+    pool = (db_engine or engine).pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+        "checkouts": pool.checkouts,
+        "avg_wait_ms": round(pool.wait_seconds / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+        "max_wait_ms": round(pool.max_wait_seconds * 1000, 3),
+        "timeouts": pool.timeouts
+    }
+
+engine = create_db_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# JSON documents, decoded by the dialect as rows are fetched; JSONB on Postgres
+# so they can be GIN-indexed. None is stored as SQL NULL rather than JSON null.
+JSONDocument = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+def upsert(db, model):
+    """INSERT supporting on_conflict_do_update for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+class ReplicaSet:
+    """Sessions on read replicas, picked round-robin or by fewest checked-out connections."""
+
+    def __init__(self, urls, selection: str):
+        self.engines = [create_db_engine(url) for url in urls]
+        self.selection = selection
+        self._session_factories = [
+            sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in self.engines
+        ]
+        self._counter = itertools.count()
+
+    def session_factory(self):
+        # Rotate the starting replica so ties spread across all of them
+        start = next(self._counter)
+        order = [(start + i) % len(self.engines) for i in range(len(self.engines))]
+        if self.selection == "least_connections":
+            index = min(order, key=lambda i: self.engines[i].pool.checkedout())
+        else:
+            index = order[0]
+        return self._session_factories[index]
+
+replicas = ReplicaSet(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    settings.REPLICA_SELECTION
+)
+
+# Users who wrote within the last READ_YOUR_WRITES_SECONDS
+recent_writers = create_cache("recent_writers", 100000, settings.READ_YOUR_WRITES_SECONDS)
+
+def _token_subject(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        # Only steers routing; handlers still verify the token
+        return jwt.get_unverified_claims(authorization[7:]).get("sub")
+    except JWTError:
+        return None
+
+async def read_your_writes_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if replicas.engines and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        subject = _token_subject(request)
+        if subject:
+            recent_writers.set(subject, True)
+    return response
+
+def get_read_db(request: Request):
+    """Session for read-only handlers: a replica, or the primary for users who just wrote."""
+    subject = _token_subject(request)
+    if not replicas.engines or (subject and recent_writers.get(subject)):
+        session_factory = SessionLocal
+    else:
+        session_factory = replicas.session_factory()
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@contextmanager
+def count_queries(bind=engine):
+    """Count the SQL statements executed on an engine inside the block.
+
+    query_counts.py uses it to check that list endpoints issue a constant
+    number of queries regardless of page size.
+    """
+    counter = {"count": 0}
+
+    def _count(*args):
+        counter["count"] += 1
+
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
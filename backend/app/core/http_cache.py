@@ -0,0 +1,102 @@
+import hashlib
+import uuid
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.cache import create_cache
+from app.core.config import settings
+
+# Public read endpoints served from the response cache
+CACHED_RESOURCES = {"posts", "events", "jobs", "users"}
+# /api/<resource>/<view> paths that list the collection rather than name an item
+COLLECTION_VIEWS = {"search"}
+# /api/<resource>/<view> paths whose body depends on the signed-in user
+PER_USER_VIEWS = {("posts", "timeline")}
+
+response_cache = create_cache("responses", settings.RESPONSE_CACHE_MAX_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+# Not replayed from the cache; recomputed for every response
+_SKIPPED_HEADERS = {"content-length", "date", "server", "etag", "cache-control"}
+
+def _tag_for(path: str) -> Optional[str]:
+    """Map /api/<resource>/ to "<resource>" and /api/<resource>/<id> to "<resource>:<id>".
+
+    Returns None for paths that are not cached, including PER_USER_VIEWS.
+    """
+    parts = path.strip("/").split("/")
+    if len(parts) < 2 or parts[0] != "api" or parts[1] not in CACHED_RESOURCES:
+        return None
+    if len(parts) == 3 and (parts[1], parts[2]) in PER_USER_VIEWS:
+        return None
+    if len(parts) == 3 and parts[2] not in COLLECTION_VIEWS:
+        return f"{parts[1]}:{parts[2]}"
+    return parts[1]
+
+def _generation(tag: str) -> str:
+    # Entries are keyed by their tag's current generation, so bumping it
+    # orphans every entry under the tag; orphans age out through the TTL
+    generation = response_cache.get("generation:" + tag)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        response_cache.set("generation:" + tag, generation, ttl=settings.RESPONSE_CACHE_TTL_SECONDS * 10)
+    return generation
+
+def invalidate(resource: str, resource_id: Optional[str] = None):
+    """Drop cached list responses for a resource, and one item's detail if given."""
+    tags = [resource] + ([f"{resource}:{resource_id}"] if resource_id else [])
+    for tag in tags:
+        response_cache.delete("generation:" + tag)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [value.strip() for value in header.split(",")]
+
+def _cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}, must-revalidate"
+    }
+
+async def response_cache_middleware(request: Request, call_next):
+    tag = _tag_for(request.url.path)
+    # Cached paths return the same body to every caller, signed in or not, so
+    # the Authorization header the frontend always sends does not bypass them
+    if request.method != "GET" or tag is None:
+        return await call_next(request)
+
+    key = f"response:{tag}:{_generation(tag)}:{request.url.path}?{request.url.query}"
+    cached = response_cache.get(key)
+    if cached is not None:
+        if _etag_matches(request, cached["etag"]):
+            return Response(status_code=304, headers=_cache_headers(cached["etag"]))
+        return Response(
+            content=cached["body"].encode(),
+            status_code=200,
+            headers={**dict(cached["headers"]), **_cache_headers(cached["etag"])}
+        )
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    # Strong validator over the serialized representation, which carries
+    # updated_at as well as the counters that change without touching it
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = [
+        [name, value] for name, value in response.headers.items()
+        if name.lower() not in _SKIPPED_HEADERS
+    ]
+    response_cache.set(key, {"etag": etag, "body": body.decode(), "headers": headers})
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return Response(
+        content=body,
+        status_code=200,
+        headers={**dict(headers), **_cache_headers(etag)}
+    )
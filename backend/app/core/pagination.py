@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import String, literal, tuple_
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Build an opaque cursor pointing at a (created_at, id) position."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Parse a cursor produced by encode_cursor, raising ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def _timestamp_param(value: datetime, dialect_name: str):
+    # SQLite keeps CURRENT_TIMESTAMP defaults as "YYYY-MM-DD HH:MM:SS" text, so
+    # the bound value has to use the same layout for the comparison to hold.
+    if dialect_name == "sqlite":
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text, String)
+    return value
+
+def keyset_before(created_col, id_col, cursor: Tuple[datetime, str], dialect_name: str):
+    """Rows strictly older than the cursor, for (created_at DESC, id DESC) order."""
+    created_at, row_id = cursor
+    return tuple_(created_col, id_col) < tuple_(_timestamp_param(created_at, dialect_name), row_id)
+
+def keyset_after(created_col, id_col, cursor: Tuple[datetime, str], dialect_name: str):
+    """Rows strictly newer than the cursor, for (created_at ASC, id ASC) order."""
+    created_at, row_id = cursor
+    return tuple_(created_col, id_col) > tuple_(_timestamp_param(created_at, dialect_name), row_id)
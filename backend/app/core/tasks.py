@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class InProcessBackend:
+    """Runs tasks on one bounded thread pool per queue inside the web process."""
+
+    def __init__(self):
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._seen = TTLCache(100000, settings.TASK_IDEMPOTENCY_TTL_SECONDS)
+        self._lock = threading.Lock()
+
+    def _executor(self, queue: str) -> ThreadPoolExecutor:
+        with self._lock:
+            if queue not in self._executors:
+                self._executors[queue] = ThreadPoolExecutor(
+                    max_workers=settings.TASK_QUEUE_CONCURRENCY.get(queue, 1),
+                    thread_name_prefix=f"task-{queue}"
+                )
+            return self._executors[queue]
+
+    def claim(self, key: str) -> bool:
+        with self._lock:
+            if self._seen.get(key) is not None:
+                return False
+            self._seen.set(key, True)
+            return True
+
+    def release(self, key: str):
+        self._seen.delete(key)
+
+    def submit(self, task: "Task", args: tuple, kwargs: dict, idempotency_key: Optional[str]):
+        self._executor(task.queue).submit(self._run, task, args, kwargs, idempotency_key)
+
+    def _run(self, task: "Task", args: tuple, kwargs: dict, idempotency_key: Optional[str]):
+        for attempt in range(task.max_retries + 1):
+            try:
+                return task.fn(*args, **kwargs)
+            except Exception:
+                if attempt == task.max_retries:
+                    logger.exception("Task %s failed after %d attempts", task.name, attempt + 1)
+                    if idempotency_key:
+                        self.release(idempotency_key)
+                    return
+                time.sleep(task.retry_delay * 2 ** attempt)
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+class CeleryBackend:
+    """Sends tasks to Celery workers; run one worker per queue to cap its concurrency,
+    e.g. `celery -A app.tasks worker -Q timeline -c 2`."""
+
+    def __init__(self, broker_url: str):
+        import redis
+        from celery import Celery
+
+        self.app = Celery("trumpet", broker=broker_url)
+        self.app.conf.task_acks_late = True
+        self.app.conf.worker_prefetch_multiplier = 1
+        self._redis = redis.Redis.from_url(broker_url)
+        self._celery_tasks = {}
+
+    def register(self, task: "Task"):
+        @self.app.task(name=task.name, bind=True, max_retries=task.max_retries)
+        def run(celery_task, *args, idempotency_key=None, **kwargs):
+            try:
+                return task.fn(*args, **kwargs)
+            except Exception as exc:
+                if celery_task.request.retries >= task.max_retries and idempotency_key:
+                    self.release(idempotency_key)
+                raise celery_task.retry(exc=exc, countdown=task.retry_delay * 2 ** celery_task.request.retries)
+
+        self._celery_tasks[task.name] = run
+
+    def claim(self, key: str) -> bool:
+        return bool(self._redis.set("trumpet:task:" + key, 1, nx=True, ex=settings.TASK_IDEMPOTENCY_TTL_SECONDS))
+
+    def release(self, key: str):
+        self._redis.delete("trumpet:task:" + key)
+
+    def submit(self, task: "Task", args: tuple, kwargs: dict, idempotency_key: Optional[str]):
+        self._celery_tasks[task.name].apply_async(
+            args=args,
+            kwargs={**kwargs, "idempotency_key": idempotency_key},
+            queue=task.queue
+        )
+
+    def shutdown(self):
+        pass
+
+def _create_backend():
+    if settings.TASK_BACKEND == "celery":
+        return CeleryBackend(settings.CELERY_BROKER_URL or settings.REDIS_URL)
+    return InProcessBackend()
+
+backend = _create_backend()
+
+class Task:
+    """A function that can be queued with .delay(); arguments must be JSON-serializable."""
+
+    def __init__(self, fn: Callable, name: str, queue: str, max_retries: int, retry_delay: float):
+        self.fn = fn
+        self.name = name
+        self.queue = queue
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.fn(*args, **kwargs)
+
+    def delay(self, *args, idempotency_key: Optional[str] = None, **kwargs) -> bool:
+        """Queue the task; returns False if the idempotency key was already used."""
+        if idempotency_key:
+            idempotency_key = f"{self.name}:{idempotency_key}"
+            if not backend.claim(idempotency_key):
+                return False
+        backend.submit(self, args, kwargs, idempotency_key)
+        return True
+
+def task(queue: str = "default", max_retries: int = 3, retry_delay: float = 1.0):
+    """Register a function as a background task on the given queue."""
+    def decorator(fn: Callable) -> Task:
+        registered = Task(fn, f"{fn.__module__}.{fn.__name__}", queue, max_retries, retry_delay)
+        if isinstance(backend, CeleryBackend):
+            backend.register(registered)
+        return registered
+    return decorator
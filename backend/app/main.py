@@ -3,12 +3,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
-from app.api import auth, users, posts, events, jobs, messages, notifications
-from app.core.database import engine, Base
+from app.api import auth, users, posts, events, jobs, messages, notifications, realtime
+from app.core.database import pool_stats, read_your_writes_middleware, replicas
 from app.core.config import settings
+from app.core.http_cache import response_cache, response_cache_middleware
+from app.services.auth import user_cache
+from app.services.realtime import broker, registry
+from app.services.notifications import notification_writer
+from app.core.tasks import backend as task_backend
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (`alembic upgrade head`); importing the
+# app does not touch the database, so workers start without reflecting it
 
 app = FastAPI(
     title="Trumpet API",
@@ -16,6 +21,12 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Response cache for public reads; registered first so CORS wraps cached replies too
+app.middleware("http")(response_cache_middleware)
+
+# Marks users who just wrote so get_read_db keeps them on the primary
+app.middleware("http")(read_your_writes_middleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Before-Cursor", "X-After-Cursor"],
 )
 
 # Include routers
@@ -33,6 +45,18 @@ app.include_router(events.router, prefix="/api/events", tags=["events"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(messages.router, prefix="/api/messages", tags=["messages"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
+app.include_router(realtime.router, tags=["realtime"])
+
+@app.on_event("startup")
+async def start_background_services():
+    await broker.start()
+    notification_writer.start()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    notification_writer.stop()
+    task_backend.shutdown()
+    await broker.stop()
 
 # Health check endpoint
 @app.get("/api/health")
@@ -43,6 +67,18 @@ async def health_check():
         "version": "1.0.0"
     }
 
+# Runtime metrics
+@app.get("/api/metrics")
+async def metrics():
+    return {
+        "auth_cache": user_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "websocket_connections": registry.connection_count(),
+        "notification_writer": notification_writer.stats(),
+        "db_pool": pool_stats(),
+        "db_replica_pools": [pool_stats(replica) for replica in replicas.engines]
+    }
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -1,7 +1,10 @@
-from .user import User
+from .user import User, UserInterest
 from .post import Post
 from .event import Event, EventAttendee
-from .job import Job, JobApplication
+from .job import Job, JobApplication, JobFacet
 from .message import Message
-from .notification import Notification
+from .notification import Notification, NotificationCounter
 from .connection import Connection
+from .conversation import Conversation
+from .timeline import TimelineEntry
+from .place import Place
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -16,3 +16,11 @@ class Connection(Base):
     # Relationships
     requester = relationship("User", foreign_keys=[requester_id], back_populates="connections_initiated")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="connections_received")
+
+    __table_args__ = (
+        # One request per ordered pair of users
+        UniqueConstraint("requester_id", "receiver_id", name="uq_connections_requester_receiver"),
+        # A user's accepted connections in either direction, covering the other id
+        Index("ix_connections_requester_status_receiver", "requester_id", "status", "receiver_id"),
+        Index("ix_connections_receiver_status_requester", "receiver_id", "status", "requester_id"),
+    )
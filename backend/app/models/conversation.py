@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+class Conversation(Base):
+    """Per-user inbox entry, kept in step with messages on every write."""
+    __tablename__ = "conversations"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    partner_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    last_message_id = Column(String, ForeignKey("messages.id"), nullable=False)
+    last_message_at = Column(DateTime(timezone=True), nullable=False)
+    # Read watermark: the partner's messages up to this (created_at, id) are read
+    last_read_at = Column(DateTime(timezone=True), nullable=True)
+    last_read_message_id = Column(String, nullable=True)
+    # The partner's messages past the watermark; bumped on receipt, recounted on read
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Relationships
+    partner = relationship("User", foreign_keys=[partner_id])
+    last_message = relationship("Message")
+
+    __table_args__ = (
+        # Inbox reads are a range scan ordered by latest activity
+        Index("ix_conversations_user_last_message_at", "user_id", "last_message_at"),
+    )
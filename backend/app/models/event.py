@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Integer, Float, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,9 +10,17 @@ class Event(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     location = Column(String, nullable=False)
+    # Coordinates given by the organizer or geocoded from location; see app/services/geo.py
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True)
     date = Column(DateTime, nullable=False)
     image_url = Column(String, nullable=True)
     max_attendees = Column(Integer, nullable=True)
+    # Per-status attendee counts, maintained by app/services/events.py
+    attending_count = Column(Integer, nullable=False, default=0, server_default="0")
+    maybe_count = Column(Integer, nullable=False, default=0, server_default="0")
+    waitlisted_count = Column(Integer, nullable=False, default=0, server_default="0")
     organizer_id = Column(String, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -21,15 +29,36 @@ class Event(Base):
     organizer = relationship("User", back_populates="events_organized")
     attendees = relationship("EventAttendee", back_populates="event")
 
+    @property
+    def attendees_count(self) -> int:
+        return self.attending_count
+
+    __table_args__ = (
+        # Upcoming events in date order
+        Index("ix_events_date", "date"),
+        # Prefix ranges for "near" searches
+        Index("ix_events_geohash", "geohash"),
+        Index("ix_events_organizer_id", "organizer_id"),
+    )
+
 class EventAttendee(Base):
     __tablename__ = "event_attendees"
 
     id = Column(String, primary_key=True, index=True)
     event_id = Column(String, ForeignKey("events.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    status = Column(String, default="attending")  # attending, maybe, not_attending
+    status = Column(String, default="attending")  # attending, maybe, not_attending, waitlisted
+    waitlisted_at = Column(DateTime(timezone=True), nullable=True)  # Promotion order; set in Python for sub-second precision
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     event = relationship("Event", back_populates="attendees")
     user = relationship("User", back_populates="event_attendances")
+
+    __table_args__ = (
+        # One attendance row per user and event
+        UniqueConstraint("event_id", "user_id", name="uq_event_attendees_event_user"),
+        # Next in line on an event's waitlist
+        Index("ix_event_attendees_event_status_waitlisted", "event_id", "status", "waitlisted_at"),
+        Index("ix_event_attendees_user_id", "user_id"),
+    )
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -11,11 +11,18 @@ class Job(Base):
     description = Column(Text, nullable=False)
     company = Column(String, nullable=False)
     location = Column(String, nullable=False)
+    # Coordinates given by the poster or geocoded from location; see app/services/geo.py
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True)
     type = Column(String, nullable=False)  # full-time, part-time, contract, internship
     salary = Column(String, nullable=True)
-    requirements = Column(Text, nullable=True)  # JSON string
-    benefits = Column(Text, nullable=True)  # JSON string
+    requirements = Column(JSONDocument, nullable=True)  # List of strings
+    benefits = Column(JSONDocument, nullable=True)  # List of strings
     poster_id = Column(String, ForeignKey("users.id"), nullable=False)
+    # The poster's occupation when posted, so the job's occupation facet
+    # count is added and removed under the same value
+    poster_occupation = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -24,6 +31,16 @@ class Job(Base):
     poster = relationship("User", back_populates="jobs_posted")
     applications = relationship("JobApplication", back_populates="job")
 
+    __table_args__ = (
+        # Active jobs newest first, optionally of one type
+        Index("ix_jobs_active_created_at", "is_active", "created_at"),
+        Index("ix_jobs_active_type_created_at", "is_active", "type", "created_at"),
+        # Prefix ranges for "near" searches; with is_active leading SQLite
+        # could only use the index for one range, not a union of them
+        Index("ix_jobs_geohash", "geohash"),
+        Index("ix_jobs_poster_id", "poster_id"),
+    )
+
 class JobApplication(Base):
     __tablename__ = "job_applications"
 
@@ -39,3 +56,22 @@ class JobApplication(Base):
     # Relationships
     job = relationship("Job", back_populates="applications")
     user = relationship("User", back_populates="job_applications")
+
+    __table_args__ = (
+        # One application per user and job
+        UniqueConstraint("job_id", "user_id", name="uq_job_applications_job_user"),
+        Index("ix_job_applications_user_id", "user_id"),
+    )
+
+class JobFacet(Base):
+    """Active jobs per facet value, kept in step with job writes by app/services/job_facets.py."""
+    __tablename__ = "job_facets"
+
+    facet = Column(String, primary_key=True)  # type, location, occupation
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Most common values of a facet first
+        Index("ix_job_facets_facet_count", "facet", "count"),
+    )
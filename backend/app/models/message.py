@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 from app.core.database import Base
 
 class Message(Base):
@@ -10,9 +11,18 @@ class Message(Base):
     content = Column(Text, nullable=False)
     sender_id = Column(String, ForeignKey("users.id"), nullable=False)
     receiver_id = Column(String, ForeignKey("users.id"), nullable=False)
-    is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    is_read = Column(Boolean, default=False)  # Legacy flag; read state is the watermark on conversations
+    # Set in Python for sub-second precision: SQLite's CURRENT_TIMESTAMP has whole
+    # seconds, which would leave a burst of messages in arbitrary cursor order
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(timezone.utc))
 
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], back_populates="messages_sent")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="messages_received")
+
+    __table_args__ = (
+        # Thread lookups and latest-message-per-partner for the inbox
+        Index("ix_messages_sender_receiver_created", "sender_id", "receiver_id", "created_at"),
+        # Unread counts per partner
+        Index("ix_messages_receiver_is_read", "receiver_id", "is_read"),
+    )
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
 
 class Notification(Base):
     __tablename__ = "notifications"
@@ -12,8 +12,24 @@ class Notification(Base):
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
-    data = Column(Text, nullable=True)  # JSON string
+    data = Column(JSONDocument, nullable=True)  # post_id, event_id, job_id, ... per type
+    group_key = Column(String, nullable=True)  # Unread notifications sharing a key are merged, e.g. "like:<post_id>"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        # Finding the unread notification to merge a repeated like into
+        Index("ix_notifications_user_group_read", "user_id", "group_key", "is_read"),
+        # A user's notifications newest first, all or unread only
+        Index("ix_notifications_user_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_read_created_at", "user_id", "is_read", "created_at"),
+    )
+
+class NotificationCounter(Base):
+    """Unread notifications per user, kept in step with notification writes."""
+    __tablename__ = "notification_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, Float, Index
+from app.core.database import Base
+
+class Place(Base):
+    """Known cities for offline geocoding of free-text locations."""
+    __tablename__ = "places"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    name_key = Column(String, nullable=False)  # Normalized: lowercase, single spaces
+    country = Column(String, nullable=False)  # ISO 3166-1 alpha-2
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    population = Column(Integer, nullable=False, default=0)  # Breaks ties between same-named places
+
+    __table_args__ = (
+        Index("ix_places_name_key_population", "name_key", "population"),
+    )
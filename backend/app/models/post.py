@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, ForeignKey, Index, UniqueConstraint, true
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,6 +10,9 @@ class Post(Base):
     content = Column(Text, nullable=False)
     image_url = Column(String, nullable=True)
     author_id = Column(String, ForeignKey("users.id"), nullable=False)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained by like_post
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained by add_comment
+    fanned_out = Column(Boolean, nullable=False, default=True, server_default=true())  # False: pulled into timelines on read
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -18,6 +21,15 @@ class Post(Base):
     comments = relationship("Comment", back_populates="post")
     likes = relationship("Like", back_populates="post")
 
+    __table_args__ = (
+        # Keyset pagination for the feed seeks on (created_at, id)
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # Timeline reads pull the few posts that were not fanned out
+        Index("ix_posts_fanned_out_created_at", "fanned_out", "created_at", "id"),
+        # Posts by author, newest first; also serves the author foreign key
+        Index("ix_posts_author_created_at", "author_id", "created_at", "id"),
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -32,6 +44,12 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
+    __table_args__ = (
+        # A post's comments in order
+        Index("ix_comments_post_created_at", "post_id", "created_at"),
+        Index("ix_comments_author_id", "author_id"),
+    )
+
 class Like(Base):
     __tablename__ = "likes"
 
@@ -43,3 +61,9 @@ class Like(Base):
     # Relationships
     post = relationship("Post", back_populates="likes")
     user = relationship("User", back_populates="likes")
+
+    __table_args__ = (
+        # One like per user and post; also the "already liked?" lookup
+        UniqueConstraint("post_id", "user_id", name="uq_likes_post_user"),
+        Index("ix_likes_user_id", "user_id"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from app.core.database import Base
+
+class TimelineEntry(Base):
+    """A post materialized into one user's home timeline."""
+    __tablename__ = "timeline_entries"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    post_id = Column(String, ForeignKey("posts.id"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)  # Copied from the post
+
+    __table_args__ = (
+        # Timeline reads are one range scan per user
+        Index("ix_timeline_entries_user_created_post", "user_id", "created_at", "post_id"),
+    )
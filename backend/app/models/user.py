@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Text
+from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
 
 class User(Base):
     __tablename__ = "users"
@@ -14,8 +14,12 @@ class User(Base):
     password_hash = Column(String, nullable=False)
     avatar = Column(String, nullable=True)
     occupation = Column(String, nullable=False)
-    interests = Column(Text, nullable=False)  # JSON string
+    interests = Column(JSONDocument, nullable=False)  # List as entered; user_interests is the queryable copy
     location = Column(String, nullable=False)
+    # Coordinates given by the user or geocoded from location; see app/services/geo.py
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True)
     bio = Column(Text, nullable=True)
     is_verified = Column(Boolean, default=False)
     is_premium = Column(Boolean, default=False)
@@ -37,3 +41,27 @@ class User(Base):
     notifications = relationship("Notification", back_populates="user")
     connections_initiated = relationship("Connection", foreign_keys="Connection.requester_id", back_populates="requester")
     connections_received = relationship("Connection", foreign_keys="Connection.receiver_id", back_populates="receiver")
+    interest_links = relationship("UserInterest", back_populates="user", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Newest-first user listing, optionally narrowed to an occupation;
+        # occupation also selects timeline audiences
+        Index("ix_users_created_at", "created_at"),
+        Index("ix_users_occupation_created_at", "occupation", "created_at"),
+        # Prefix ranges for "near" searches
+        Index("ix_users_geohash", "geohash"),
+    )
+
+class UserInterest(Base):
+    __tablename__ = "user_interests"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    interest = Column(String, primary_key=True)  # Normalized: stripped, lowercase
+
+    # Relationships
+    user = relationship("User", back_populates="interest_links")
+
+    __table_args__ = (
+        # Interest -> users lookups for filtering and matchmaking
+        Index("ix_user_interests_interest_user", "interest", "user_id"),
+    )
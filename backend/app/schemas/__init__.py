@@ -1,7 +1,7 @@
-from .user import User, UserCreate, UserUpdate, UserResponse
-from .post import Post, PostCreate, PostResponse
-from .event import Event, EventCreate, EventResponse, EventAttendeeCreate
-from .job import Job, JobCreate, JobResponse, JobApplicationCreate
-from .message import Message, MessageCreate, MessageResponse
-from .notification import Notification, NotificationResponse
-from .connection import Connection, ConnectionCreate, ConnectionResponse
+from .user import UserCreate, UserUpdate, UserResponse
+from .post import PostCreate, PostResponse
+from .event import EventCreate, EventResponse, EventAttendeeCreate
+from .job import JobCreate, JobResponse, JobApplicationCreate
+from .message import MessageCreate, MessageResponse
+from .notification import NotificationResponse
+from .connection import ConnectionCreate, ConnectionResponse
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from .user import UserResponse
@@ -7,6 +7,8 @@ class EventBase(BaseModel):
     title: str
     description: str
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # Geocoded from location when omitted
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     date: datetime
     max_attendees: Optional[int] = None
     image_url: Optional[str] = None
@@ -21,6 +23,10 @@ class EventResponse(EventBase):
     updated_at: Optional[datetime] = None
     organizer: UserResponse
     attendees_count: int = 0
+    attending_count: int = 0
+    maybe_count: int = 0
+    waitlisted_count: int = 0
+    distance_km: Optional[float] = None  # Set on "near" searches
 
     class Config:
         from_attributes = True
@@ -32,7 +38,8 @@ class EventAttendeeResponse(BaseModel):
     id: str
     event_id: str
     user_id: str
-    status: str
+    status: str  # waitlisted when the event was full
+    waitlisted_at: Optional[datetime] = None
     created_at: datetime
     user: UserResponse
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, List
 from datetime import datetime
 from .user import UserResponse
 
@@ -8,6 +8,8 @@ class JobBase(BaseModel):
     description: str
     company: str
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # Geocoded from location when omitted
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     type: str  # full-time, part-time, contract, internship
     salary: Optional[str] = None
     requirements: Optional[List[str]] = None
@@ -24,10 +26,27 @@ class JobResponse(JobBase):
     updated_at: Optional[datetime] = None
     poster: UserResponse
     applications_count: int = 0
+    distance_km: Optional[float] = None  # Set on "near" searches
 
     class Config:
         from_attributes = True
 
+class JobActiveUpdate(BaseModel):
+    is_active: bool
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class JobSearchResponse(BaseModel):
+    jobs: List[JobResponse]
+    total: int
+    # Counts keyed by facet: type, location, occupation. facets_scope says what
+    # they count: "all_active" jobs for an unfiltered search, otherwise
+    # "matches", the best JOB_SEARCH_FACET_SCAN_LIMIT jobs matching q and filters
+    facets: Dict[str, List[FacetCount]]
+    facets_scope: str
+
 class JobApplicationCreate(BaseModel):
     cover_letter: Optional[str] = None
     resume_url: Optional[str] = None
@@ -25,3 +25,12 @@ class ConversationResponse(BaseModel):
     user: UserResponse
     last_message: MessageResponse
     unread_count: int = 0
+
+class ReadReceiptCreate(BaseModel):
+    message_id: Optional[str] = None  # Defaults to the latest message in the thread
+
+class ReadReceiptResponse(BaseModel):
+    partner_id: str
+    last_read_message_id: Optional[str] = None
+    last_read_at: Optional[datetime] = None
+    unread_count: int = 0
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -10,6 +10,8 @@ class UserBase(BaseModel):
     occupation: str
     interests: List[str]
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)  # Geocoded from location when omitted
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     bio: Optional[str] = None
 
 class UserCreate(UserBase):
@@ -21,6 +23,8 @@ class UserUpdate(BaseModel):
     bio: Optional[str] = None
     interests: Optional[List[str]] = None
     location: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class UserResponse(UserBase):
     id: str
@@ -31,10 +35,15 @@ class UserResponse(UserBase):
     experience: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    distance_km: Optional[float] = None  # Set on "near" searches
 
     class Config:
         from_attributes = True
 
+class UserMatchResponse(BaseModel):
+    user: UserResponse
+    shared_interests: int
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
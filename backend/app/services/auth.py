@@ -1,24 +1,54 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import create_cache
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Decoded tokens and user rows, so authenticated requests skip the users lookup
+user_cache = create_cache("auth", settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+# Never cached; loaded on access if an endpoint needs it
+_UNCACHED_USER_FIELDS = {"password_hash"}
+
+# Bounded pool so a login burst can't take over every worker thread
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with a different BCRYPT_ROUNDS than configured."""
+    return pwd_context.needs_update(hashed_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -29,12 +59,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def _token_key(token: str) -> str:
+    return "token:" + hashlib.sha256(token.encode()).hexdigest()
+
+def _user_key(user_id: str) -> str:
+    return "user:" + user_id
+
+def _dump_user(user: User) -> dict:
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in _UNCACHED_USER_FIELDS:
+            continue
+        value = getattr(user, column.key)
+        data[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+def _load_user(data: dict, db: Session) -> User:
+    values = {}
+    for column in User.__table__.columns:
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    user = User(**values)
+    # Attach as an already-persisted row so updates and lazy loads still work
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+def _decode_token(token: str, credentials_exception: HTTPException) -> str:
+    key = _token_key(token)
+    cached = user_cache.get(key)
+    if cached is not None and cached["exp"] > time.time():
+        return cached["sub"]
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
@@ -43,7 +102,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
+    expires_in = payload["exp"] - time.time()
+    if expires_in > 0:
+        user_cache.set(key, {"sub": user_id, "exp": payload["exp"]}, ttl=min(expires_in, settings.AUTH_CACHE_TTL_SECONDS))
+    return user_id
+
+def get_user_id_from_token(token: str) -> Optional[str]:
+    """User id for a valid access token, or None; for callers outside Depends."""
+    try:
+        return _decode_token(token, HTTPException(status_code=status.HTTP_401_UNAUTHORIZED))
+    except HTTPException:
+        return None
+
+def invalidate_cached_user(user_id: str):
+    """Drop a user's cached row; call after changing it."""
+    user_cache.delete(_user_key(user_id))
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    user_id = _decode_token(token, credentials_exception)
+    
+    cached = user_cache.get(_user_key(user_id))
+    if cached is not None:
+        return _load_user(cached, db)
+    
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
+    user_cache.set(_user_key(user_id), _dump_user(user))
     return user
@@ -0,0 +1,79 @@
+from sqlalchemy import func, literal, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert
+from app.models.conversation import Conversation
+from app.models.message import Message
+
+def _upsert(db: Session, user_id: str, partner_id: str, message: Message, unread: int):
+    stmt = upsert(db, Conversation).values(
+        user_id=user_id,
+        partner_id=partner_id,
+        last_message_id=message.id,
+        # The message's own timestamp, so the inbox order agrees with last_message_id
+        last_message_at=message.created_at,
+        unread_count=unread
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Conversation.user_id, Conversation.partner_id],
+        set_={
+            "last_message_id": stmt.excluded.last_message_id,
+            "last_message_at": stmt.excluded.last_message_at,
+            "unread_count": Conversation.unread_count + unread
+        }
+    )
+    db.execute(stmt)
+
+def record_message(db: Session, message: Message):
+    """Update both participants' inbox entries; runs in the caller's transaction."""
+    _upsert(db, message.sender_id, message.receiver_id, message, 0)
+    if message.receiver_id != message.sender_id:
+        _upsert(db, message.receiver_id, message.sender_id, message, 1)
+
+def count_unread():
+    """Correlated count of the partner's messages past a conversation's read watermark.
+
+    For recounting the stored unread_count (see backfill.py); inbox reads use
+    the column.
+    """
+    return select(func.count(Message.id)).where(
+        Message.sender_id == Conversation.partner_id,
+        Message.receiver_id == Conversation.user_id,
+        Conversation.user_id != Conversation.partner_id,
+        or_(
+            Conversation.last_read_at.is_(None),
+            tuple_(Message.created_at, Message.id) >
+            tuple_(Conversation.last_read_at, Conversation.last_read_message_id)
+        )
+    ).correlate(Conversation).scalar_subquery()
+
+def advance_read_watermark(db: Session, user_id: str, partner_id: str, message_id: str) -> bool:
+    """Move user_id's read position with partner_id forward to message_id.
+
+    A single-row conditional UPDATE that also recounts the row's unread_count
+    from the partner's messages after the new watermark; returns False if the
+    watermark was already at or past the message. Runs in the caller's
+    transaction.
+    """
+    # Copied from the message row so the stored value keeps its exact format
+    created_at = select(Message.created_at).where(Message.id == message_id).scalar_subquery()
+    still_unread = select(func.count(Message.id)).where(
+        Message.sender_id == partner_id,
+        Message.receiver_id == user_id,
+        Message.sender_id != Message.receiver_id,
+        tuple_(Message.created_at, Message.id) > tuple_(created_at, literal(message_id))
+    ).scalar_subquery()
+    updated = db.query(Conversation).filter(
+        Conversation.user_id == user_id,
+        Conversation.partner_id == partner_id,
+        or_(
+            Conversation.last_read_at.is_(None),
+            tuple_(Conversation.last_read_at, Conversation.last_read_message_id) <
+            tuple_(created_at, literal(message_id))
+        )
+    ).update({
+        "last_read_at": created_at,
+        "last_read_message_id": message_id,
+        "unread_count": still_unread
+    }, synchronize_session=False)
+    return updated > 0
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import uuid
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, EventAttendee
+
+# Statuses a user can ask for; "waitlisted" is assigned when the event is full
+REQUESTABLE_STATUSES = {"attending", "maybe", "not_attending"}
+
+_COUNTERS = {
+    "attending": Event.attending_count,
+    "maybe": Event.maybe_count,
+    "waitlisted": Event.waitlisted_count,
+}
+
+def _adjust_counter(db: Session, event_id: str, status: Optional[str], delta: int):
+    counter = _COUNTERS.get(status)
+    if counter is not None:
+        db.query(Event).filter(Event.id == event_id).update({counter: counter + delta}, synchronize_session=False)
+
+def _claim_seat(db: Session, event_id: str) -> bool:
+    """Take one attending seat with a conditional UPDATE; False when the event is full.
+
+    The capacity check and the increment are one statement, so concurrent
+    sign-ups serialize on the event row and cannot oversubscribe it.
+    """
+    claimed = db.query(Event).filter(
+        Event.id == event_id,
+        or_(Event.max_attendees.is_(None), Event.attending_count < Event.max_attendees)
+    ).update({Event.attending_count: Event.attending_count + 1}, synchronize_session=False)
+    return claimed == 1
+
+def _promote_waitlist(db: Session, event_id: str) -> List[EventAttendee]:
+    """Move waitlisted attendees into free seats, oldest first."""
+    promoted = []
+    while _claim_seat(db, event_id):
+        candidates = db.query(EventAttendee).filter(
+            EventAttendee.event_id == event_id,
+            EventAttendee.status == "waitlisted"
+        ).order_by(EventAttendee.waitlisted_at, EventAttendee.id).limit(5).all()
+        for candidate in candidates:
+            # Conditional so two promoters never move the same attendee
+            moved = db.query(EventAttendee).filter(
+                EventAttendee.id == candidate.id,
+                EventAttendee.status == "waitlisted"
+            ).update({"status": "attending", "waitlisted_at": None}, synchronize_session=False)
+            if moved:
+                _adjust_counter(db, event_id, "waitlisted", -1)
+                promoted.append(candidate)
+                break
+        else:
+            # Nobody left to promote; give the seat back
+            _adjust_counter(db, event_id, "attending", -1)
+            break
+    return promoted
+
+def set_attendance(
+    db: Session,
+    event_id: str,
+    user_id: str,
+    requested_status: str
+) -> Tuple[EventAttendee, Optional[str], List[EventAttendee]]:
+    """Record a user's response to an event and keep the counters in step.
+
+    Returns the attendee row, the status it had before (None if new) and
+    anyone promoted off the waitlist. Runs in the caller's transaction.
+    """
+    attendee = db.query(EventAttendee).filter(
+        EventAttendee.event_id == event_id,
+        EventAttendee.user_id == user_id
+    ).first()
+    previous_status = attendee.status if attendee else None
+    if previous_status == requested_status:
+        return attendee, previous_status, []
+    
+    status = requested_status
+    if requested_status == "attending" and not _claim_seat(db, event_id):
+        status = "waitlisted"
+    if status == previous_status:
+        # Still waiting; keep the place in line
+        return attendee, previous_status, []
+    
+    if attendee is None:
+        attendee = EventAttendee(id=str(uuid.uuid4()), event_id=event_id, user_id=user_id)
+        db.add(attendee)
+    attendee.status = status
+    attendee.waitlisted_at = datetime.now(timezone.utc) if status == "waitlisted" else None
+    
+    _adjust_counter(db, event_id, previous_status, -1)
+    if status != "attending":
+        _adjust_counter(db, event_id, status, 1)
+    
+    promoted = []
+    if previous_status == "attending":
+        db.flush()
+        promoted = _promote_waitlist(db, event_id)
+    return attendee, previous_status, promoted
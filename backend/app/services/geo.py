@@ -0,0 +1,202 @@
+import math
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.models.place import Place
+
+# Geohash cells are base32 strings; each character narrows a cell 32-fold and
+# a cell's sub-cells share its prefix, so "within this cell" is a range scan
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # About 5 m cells
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+MAX_RADIUS_KM = 500
+# Most geohash ranges a radius search ORs together
+MAX_COVERING_CELLS = 16
+# Longest place name tried when geocoding, in words ("rio de janeiro")
+MAX_PLACE_WORDS = 3
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate longitude, latitude, starting with longitude
+        span, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (span[0] + span[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            span[0] = middle
+        else:
+            span[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width of a geohash cell in degrees."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+def _prefix_end(prefix: str) -> Optional[str]:
+    """Smallest geohash greater than every geohash starting with prefix."""
+    while prefix and prefix[-1] == BASE32[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + BASE32[BASE32.index(prefix[-1]) + 1]
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """South, north, west and east edges of a box around a circle, in degrees.
+
+    west > east when the box crosses the antimeridian; both are None when it
+    spans every longitude (the circle reaches a pole).
+    """
+    delta_latitude = radius_km / KM_PER_DEGREE
+    south, north = latitude - delta_latitude, latitude + delta_latitude
+    if south <= -90.0 or north >= 90.0:
+        return max(south, -90.0), min(north, 90.0), None, None
+    # Longitude degrees are narrowest at the box's poleward edge
+    delta_longitude = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max(abs(south), abs(north)))))
+    if delta_longitude >= 180.0:
+        return south, north, None, None
+    west = (longitude - delta_longitude + 180.0) % 360.0 - 180.0
+    east = (longitude + delta_longitude + 180.0) % 360.0 - 180.0
+    return south, north, west, east
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> Optional[List[str]]:
+    """Geohash prefixes whose cells together cover a circle, or None for the whole globe.
+
+    Uses the finest precision at which at most MAX_COVERING_CELLS cells cover
+    the circle's bounding box, so the cells stay close to the circle's size.
+    """
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        columns_around = round(360.0 / width)
+        first_row = int((south + 90.0) // height)
+        last_row = min(int((north + 90.0) // height), round(180.0 / height) - 1)
+        if west is None:
+            first_column, columns = 0, columns_around
+        else:
+            # Unwrapped across the antimeridian, so east is always right of west
+            unwrapped_east = east if east >= west else east + 360.0
+            first_column = int((west + 180.0) // width)
+            columns = min(int((unwrapped_east + 180.0) // width) - first_column + 1, columns_around)
+        if (last_row - first_row + 1) * columns <= MAX_COVERING_CELLS:
+            break
+    else:
+        return None
+    cells = set()
+    for row in range(first_row, last_row + 1):
+        for column in range(first_column, first_column + columns):
+            # A cell's centre encodes to the cell itself
+            cell_latitude = -90.0 + (row + 0.5) * height
+            cell_longitude = -180.0 + (column % columns_around + 0.5) * width
+            cells.add(encode_geohash(cell_latitude, cell_longitude, precision))
+    return sorted(cells)
+
+def distance_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(longitude2 - longitude1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def parse_near(near: str) -> Tuple[float, float]:
+    """Parse a "lat,lon" query parameter, raising ValueError if malformed."""
+    try:
+        latitude, longitude = (float(part) for part in near.split(","))
+    except ValueError:
+        raise ValueError("near must be \"lat,lon\"")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("near is out of range")
+    return latitude, longitude
+
+def within_radius(query: Query, model, latitude: float, longitude: float, radius_km: float, skip: int, limit: int) -> list:
+    """A page of query's rows within radius_km of a point, nearest first, with distance_km set.
+
+    The geohash prefix ranges narrow the candidates through the model's geohash
+    index and a bounding-box check trims them to the circle's box. Only the
+    candidates' coordinates are read to rank them by exact distance; full rows
+    are loaded for the page alone.
+    """
+    south, north, west, east = bounding_box(latitude, longitude, radius_km)
+    in_box = [model.latitude.between(south, north)]
+    if west is not None:
+        in_box.append(
+            model.longitude.between(west, east) if west <= east
+            else or_(model.longitude >= west, model.longitude <= east)
+        )
+    cells = covering_cells(latitude, longitude, radius_km)
+    if cells is None:
+        candidates = select(model.id).where(*in_box)
+    else:
+        ranges = []
+        for cell in cells:
+            end = _prefix_end(cell)
+            ranges.append(and_(model.geohash >= cell, model.geohash < end) if end else model.geohash >= cell)
+        # Candidates come from the geohash index, as a subquery so the planner
+        # cannot trade the ranges for an index on the other filters
+        candidates = select(model.id).where(or_(*ranges), *in_box)
+    query = query.filter(model.id.in_(candidates))
+
+    distances = {}
+    for row_id, row_latitude, row_longitude in query.with_entities(model.id, model.latitude, model.longitude):
+        distance = round(distance_km(latitude, longitude, row_latitude, row_longitude), 3)
+        if distance <= radius_km:
+            distances[row_id] = distance
+    page = sorted(distances, key=lambda row_id: (distances[row_id], row_id))[skip:skip + limit]
+    if not page:
+        return []
+
+    rows = {row.id: row for row in query.filter(model.id.in_(page))}
+    for row in rows.values():
+        # Not a column; read by the response schemas
+        row.distance_km = distances[row.id]
+    return [rows[row_id] for row_id in page]
+
+def place_key(name: str) -> str:
+    """Normalize a place name for lookup: no accents, lowercase, single spaces."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", stripped.lower()))
+
+def geocode(db: Session, location: str) -> Optional[Place]:
+    """Best known place mentioned in a free-text location, from the places table.
+
+    Tries every run of up to MAX_PLACE_WORDS words, so "New York Convention
+    Center" finds New York; longer names win, then larger places.
+    """
+    words = place_key(location).split()
+    candidates = {
+        " ".join(words[start:end])
+        for start in range(len(words))
+        for end in range(start + 1, min(len(words), start + MAX_PLACE_WORDS) + 1)
+    }
+    if not candidates:
+        return None
+    places = db.query(Place).filter(Place.name_key.in_(candidates)).all()
+    if not places:
+        return None
+    return max(places, key=lambda place: (len(place.name_key.split()), place.population))
+
+def set_location(db: Session, row, latitude: Optional[float] = None, longitude: Optional[float] = None):
+    """Set a user, event or job's coordinates and geohash.
+
+    Uses the given coordinates when both are present, otherwise geocodes
+    row.location; rows in unknown places get no coordinates.
+    """
+    if latitude is None or longitude is None:
+        place = geocode(db, row.location)
+        latitude, longitude = (place.latitude, place.longitude) if place else (None, None)
+    row.latitude, row.longitude = latitude, longitude
+    row.geohash = encode_geohash(latitude, longitude) if latitude is not None else None
@@ -0,0 +1,172 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import UserInterest
+
+def normalize_interests(interests: Iterable[str]) -> List[str]:
+    """Lowercase, strip and de-duplicate interests, keeping their order."""
+    normalized = []
+    for interest in interests:
+        interest = interest.strip().lower()
+        if interest and interest not in normalized:
+            normalized.append(interest)
+    return normalized
+
+def set_user_interests(db: Session, user_id: str, interests: Iterable[str]) -> List[str]:
+    """Replace a user's user_interests rows; runs in the caller's transaction."""
+    normalized = normalize_interests(interests)
+    db.query(UserInterest).filter(UserInterest.user_id == user_id).delete(synchronize_session=False)
+    db.add_all([UserInterest(user_id=user_id, interest=interest) for interest in normalized])
+    return normalized
+
+def users_with_interests(interests: List[str], match: str = "all"):
+    """Subquery of user ids having any or all of the given normalized interests."""
+    query = select(UserInterest.user_id).where(UserInterest.interest.in_(interests))
+    if match == "all":
+        query = query.group_by(UserInterest.user_id).having(
+            func.count(UserInterest.interest) == len(interests)
+        )
+    return query
+
+def _with_bits(bitmap: int, set_bits: Iterable[int], clear_bits: Iterable[int] = ()) -> int:
+    """bitmap with the given bit positions set and cleared, in one O(width) pass.
+
+    Ints are immutable, so OR-ing bits in one at a time would copy the whole
+    bitmap for every bit; this edits a bytearray and converts once.
+    """
+    set_bits = list(set_bits)
+    width = max([bitmap.bit_length()] + [bit + 1 for bit in set_bits])
+    data = bytearray(bitmap.to_bytes((width + 7) // 8, "little"))
+    for bit in set_bits:
+        data[bit >> 3] |= 1 << (bit & 7)
+    for bit in clear_bits:
+        if bit >> 3 < len(data):
+            data[bit >> 3] &= ~(1 << (bit & 7)) & 0xFF
+    return int.from_bytes(data, "little")
+
+class InterestIndex:
+    """In-memory interest -> user bitmap index for matchmaking.
+
+    Users are numbered densely and each interest holds an int whose set bits
+    are the users that have it, so intersections are bitwise ANDs. The
+    index is loaded lazily from user_interests and reloaded after
+    INTEREST_INDEX_TTL_SECONDS to pick up other workers' writes. Local writes
+    are queued by update() and folded into the bitmaps by the next read, one
+    rewrite per changed interest however many users changed it.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # Guards _pending only, so update() never waits on bitmap rewrites
+        self._lock = threading.Lock()
+        # Serializes loading and applying updates; readers don't take it
+        self._write_lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._ordinals: Dict[str, int] = {}
+        self._user_ids: List[str] = []
+        self._user_interests: Dict[str, Set[str]] = {}
+        self._bitmaps: Dict[str, int] = {}
+        self._pending: Dict[str, List[str]] = {}
+
+    def _ensure_loaded(self, db: Session):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            self._apply_pending()
+            return
+        with self._write_lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            rows = db.query(UserInterest.user_id, UserInterest.interest).yield_per(10000)
+            ordinals, user_ids, user_interests, members = {}, [], {}, {}
+            for user_id, interest in rows:
+                if user_id not in ordinals:
+                    ordinals[user_id] = len(user_ids)
+                    user_ids.append(user_id)
+                    user_interests[user_id] = set()
+                user_interests[user_id].add(interest)
+                members.setdefault(interest, []).append(ordinals[user_id])
+            self._ordinals, self._user_ids = ordinals, user_ids
+            self._user_interests = user_interests
+            self._bitmaps = {interest: _with_bits(0, bits) for interest, bits in members.items()}
+            self._loaded_at = time.monotonic()
+        # Writes queued during the load may predate it; reapplying them is harmless
+        self._apply_pending()
+
+    def update(self, user_id: str, interests: List[str]):
+        """Queue a committed change to one user's interests."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._pending[user_id] = list(interests)
+
+    def _apply_pending(self):
+        if not self._pending:
+            return
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            added: Dict[str, List[int]] = {}
+            removed: Dict[str, List[int]] = {}
+            for user_id, interests in pending.items():
+                if user_id not in self._ordinals:
+                    self._ordinals[user_id] = len(self._user_ids)
+                    self._user_ids.append(user_id)
+                ordinal = self._ordinals[user_id]
+                old, new = self._user_interests.get(user_id, set()), set(interests)
+                for interest in old - new:
+                    removed.setdefault(interest, []).append(ordinal)
+                for interest in new - old:
+                    added.setdefault(interest, []).append(ordinal)
+                self._user_interests[user_id] = new
+            for interest in added.keys() | removed.keys():
+                self._bitmaps[interest] = _with_bits(
+                    self._bitmaps.get(interest, 0), added.get(interest, []), removed.get(interest, [])
+                )
+
+    def _ids(self, bitmap: int, exclude: int = 0, limit: Optional[int] = None) -> List[str]:
+        bitmap &= ~exclude
+        ids = []
+        while bitmap and (limit is None or len(ids) < limit):
+            lowest = bitmap & -bitmap
+            ids.append(self._user_ids[lowest.bit_length() - 1])
+            bitmap ^= lowest
+        return ids
+
+    def best_matches(self, db: Session, user_id: str, limit: int) -> List[Tuple[str, int]]:
+        """Other users sharing the most interests with user_id, with the shared count."""
+        self._ensure_loaded(db)
+        interests = self._user_interests.get(user_id, set())
+        exclude = 1 << self._ordinals[user_id] if user_id in self._ordinals else 0
+        bitmaps = [self._bitmaps.get(interest, 0) for interest in interests]
+
+        # Bit-sliced counter: planes[i] holds bit i of every user's shared count
+        planes: List[int] = []
+        for carry in bitmaps:
+            for i, plane in enumerate(planes):
+                planes[i], carry = plane ^ carry, plane & carry
+                if not carry:
+                    break
+            if carry:
+                planes.append(carry)
+
+        # Only users sharing at least one interest can match
+        candidates = 0
+        for bitmap in bitmaps:
+            candidates |= bitmap
+        matches = []
+        for shared in range(len(interests), 0, -1):
+            bitmap = candidates
+            for i, plane in enumerate(planes):
+                bitmap &= plane if shared >> i & 1 else candidates ^ plane
+            if shared >> len(planes):
+                bitmap = 0
+            for match_id in self._ids(bitmap, exclude, limit - len(matches)):
+                matches.append((match_id, shared))
+            if len(matches) >= limit:
+                break
+        return matches
+
+interest_index = InterestIndex(settings.INTEREST_INDEX_TTL_SECONDS)
@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.core.database import upsert
+from app.models.job import Job, JobFacet
+
+# Facets shown next to job search results
+FACETS = ["type", "location", "occupation"]
+
+def facet_values(job: Job) -> Dict[str, str]:
+    return {"type": job.type, "location": job.location, "occupation": job.poster_occupation}
+
+def adjust_job_facets(db: Session, job: Job, delta: int):
+    """Add delta to the counts of a job's facet values; runs in the caller's transaction.
+
+    Call with +1 when a job becomes active (including on creation) and -1
+    when it is deactivated, so the counts only ever cover active jobs.
+    """
+    for facet, value in facet_values(job).items():
+        stmt = upsert(db, JobFacet).values(facet=facet, value=value, count=max(delta, 0))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobFacet.facet, JobFacet.value],
+            set_={"count": JobFacet.count + delta}
+        )
+        db.execute(stmt)
+
+def job_facet_counts(db: Session, limit: int = 20) -> Dict[str, List[dict]]:
+    """The most common values of each facet among active jobs, with their counts."""
+    counts = {}
+    for facet in FACETS:
+        rows = db.query(JobFacet.value, JobFacet.count).filter(
+            JobFacet.facet == facet, JobFacet.count > 0
+        ).order_by(JobFacet.count.desc(), JobFacet.value).limit(limit).all()
+        counts[facet] = [{"value": value, "count": count} for value, count in rows]
+    return counts
+
+def matched_facet_counts(db: Session, job_ids: Query, limit: int = 20) -> Dict[str, List[dict]]:
+    """The most common values of each facet among the jobs job_ids selects, with their counts.
+
+    A GROUP BY per facet over the given ids, so callers bound job_ids.
+    """
+    columns = {"type": Job.type, "location": Job.location, "occupation": Job.poster_occupation}
+    ids = job_ids.subquery()
+    counts = {}
+    for facet in FACETS:
+        column = columns[facet]
+        count = func.count(Job.id)
+        rows = db.query(column, count).filter(
+            Job.id.in_(ids.select())
+        ).group_by(column).order_by(count.desc(), column).limit(limit).all()
+        counts[facet] = [{"value": value, "count": count} for value, count in rows]
+    return counts
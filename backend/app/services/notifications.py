@@ -0,0 +1,235 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, upsert
+from app.models.notification import Notification, NotificationCounter
+from app.schemas.notification import NotificationResponse
+from app.services.realtime import publish
+
+logger = logging.getLogger(__name__)
+
+def adjust_unread_count(db: Session, user_id: str, delta: int):
+    """Add delta to a user's unread counter; runs in the caller's transaction."""
+    if not delta:
+        return
+    stmt = upsert(db, NotificationCounter).values(user_id=user_id, unread_count=max(delta, 0))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={"unread_count": NotificationCounter.unread_count + delta}
+    )
+    db.execute(stmt)
+
+def get_unread_count(db: Session, user_id: str) -> int:
+    count = db.query(NotificationCounter.unread_count).filter(
+        NotificationCounter.user_id == user_id
+    ).scalar()
+    return max(count or 0, 0)
+
+def publish_unread_count(db: Session, user_id: str):
+    """Push the current unread count to the user's streams; call after commit."""
+    publish(user_id, "unread_count", {"unread_count": get_unread_count(db, user_id)})
+
+def _like_message(actor_name: str, actor_count: int) -> str:
+    if actor_count == 1:
+        return f"{actor_name} liked your post"
+    others = actor_count - 1
+    return f"{actor_name} and {others} other{'s' if others > 1 else ''} liked your post"
+
+class NotificationWriter:
+    """Queues notifications from request handlers and writes them in batches.
+
+    A background thread flushes every NOTIFICATION_FLUSH_INTERVAL_MS or
+    NOTIFICATION_BATCH_SIZE items with one bulk insert. Likes on the same
+    post merge into the recipient's unread notification, which keeps the
+    distinct likers in data["actor_ids"] so a repeated like from the same
+    person is counted once. When the queue is
+    full, producers wait up to NOTIFICATION_ENQUEUE_TIMEOUT_MS and the
+    notification is then dropped rather than failing the request.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=settings.NOTIFICATION_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.enqueued = 0
+        self.written = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="notification-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Flush what is queued and stop the background thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def enqueue(
+        self,
+        user_id: str,
+        type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        group_key: Optional[str] = None,
+        actor_name: Optional[str] = None,
+        actor_id: Optional[str] = None
+    ):
+        self.start()
+        item = {
+            "user_id": user_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "data": data or {},
+            "group_key": group_key,
+            "actor_name": actor_name,
+            "actor_id": actor_id
+        }
+        try:
+            self._queue.put(item, timeout=settings.NOTIFICATION_ENQUEUE_TIMEOUT_MS / 1000)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Notification queue full; dropped %s notification for %s", type, user_id)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "merged": self.merged,
+            "dropped": self.dropped
+        }
+
+    def _run(self):
+        interval = settings.NOTIFICATION_FLUSH_INTERVAL_MS / 1000
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = []
+            deadline = time.monotonic() + interval
+            while len(batch) < settings.NOTIFICATION_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._flush(batch)
+                except Exception:
+                    logger.exception("Failed to write %d notifications", len(batch))
+
+    def _flush(self, batch: List[dict]):
+        # Collapse repeated likes within the batch first
+        groups: "OrderedDict[tuple, dict]" = OrderedDict()
+        for item in batch:
+            key = (item["user_id"], item["group_key"]) if item["group_key"] else (item["user_id"], uuid.uuid4().hex)
+            if key in groups:
+                if item["actor_id"] not in groups[key]["actor_ids"]:
+                    groups[key]["actor_ids"].append(item["actor_id"])
+                groups[key]["actor_name"] = item["actor_name"]
+                self.merged += 1
+            else:
+                groups[key] = {**item, "actor_ids": [item["actor_id"]]}
+
+        db = SessionLocal()
+        try:
+            # Then merge into unread notifications already in the database
+            grouped_keys = [key for key, item in groups.items() if item["group_key"]]
+            existing = {}
+            if grouped_keys:
+                for notification in db.query(Notification).filter(
+                    Notification.user_id.in_({user_id for user_id, _ in grouped_keys}),
+                    Notification.group_key.in_({group_key for _, group_key in grouped_keys}),
+                    Notification.is_read == False
+                ):
+                    existing[(notification.user_id, notification.group_key)] = notification
+
+            rows = []
+            updated = []
+            for key, item in groups.items():
+                notification = existing.get(key)
+                if notification is not None:
+                    self.merged += 1
+                    # Assign a new dict; in-place changes to a JSON column are not tracked
+                    data = dict(notification.data or {})
+                    actor_ids = list(data.get("actor_ids", []))
+                    new_actor_ids = [actor_id for actor_id in item["actor_ids"] if actor_id not in actor_ids]
+                    if not new_actor_ids:
+                        continue
+                    data["actor_ids"] = actor_ids + new_actor_ids
+                    # Rows written before actor_ids was kept only have the count
+                    data["actor_count"] = data.get("actor_count", len(actor_ids)) + len(new_actor_ids)
+                    notification.data = data
+                    notification.message = _like_message(item["actor_name"], data["actor_count"])
+                    updated.append(notification)
+                    continue
+                data = item["data"]
+                message = item["message"]
+                if item["group_key"]:
+                    data = {**data, "actor_ids": item["actor_ids"], "actor_count": len(item["actor_ids"])}
+                    message = _like_message(item["actor_name"], len(item["actor_ids"]))
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": item["user_id"],
+                    "type": item["type"],
+                    "title": item["title"],
+                    "message": message,
+                    "data": data,
+                    "group_key": item["group_key"]
+                })
+
+            if rows:
+                db.execute(insert(Notification), rows)
+            new_per_user = Counter(row["user_id"] for row in rows)
+            for user_id, count in new_per_user.items():
+                adjust_unread_count(db, user_id, count)
+            db.commit()
+            self.written += len(rows)
+
+            # Deliver after commit
+            fresh = db.query(Notification).filter(
+                Notification.id.in_([row["id"] for row in rows] + [n.id for n in updated])
+            ).all() if rows or updated else []
+            for notification in fresh:
+                publish(notification.user_id, "notification", NotificationResponse.model_validate(notification).model_dump(mode="json"))
+            for user_id in new_per_user:
+                publish_unread_count(db, user_id)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+notification_writer = NotificationWriter()
+
+def notify(
+    user_id: str,
+    type: str,
+    title: str,
+    message: str,
+    data: Optional[Dict[str, Any]] = None,
+    group_key: Optional[str] = None,
+    actor_name: Optional[str] = None,
+    actor_id: Optional[str] = None
+):
+    """Queue a notification; it is written and pushed shortly after."""
+    notification_writer.enqueue(user_id, type, title, message, data, group_key, actor_name, actor_id)
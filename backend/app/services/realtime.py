@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class ConnectionRegistry:
+    """Open WebSockets and event-stream subscribers on this worker, by user id."""
+
+    def __init__(self):
+        self._sockets: Dict[str, Set[WebSocket]] = defaultdict(set)
+        self._queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def add(self, user_id: str, websocket: WebSocket):
+        self._sockets[user_id].add(websocket)
+
+    def remove(self, user_id: str, websocket: WebSocket):
+        sockets = self._sockets.get(user_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self._sockets[user_id]
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Queue receiving the user's events, for streams other than WebSockets."""
+        queue = asyncio.Queue(maxsize=100)
+        self._queues[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._queues.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[user_id]
+
+    def connection_count(self) -> int:
+        return sum(len(sockets) for sockets in self._sockets.values()) + \
+            sum(len(queues) for queues in self._queues.values())
+
+    async def send(self, user_id: str, event: Dict[str, Any]):
+        for queue in list(self._queues.get(user_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled reader only misses events it would coalesce anyway
+                pass
+        for websocket in list(self._sockets.get(user_id, ())):
+            try:
+                await websocket.send_json(event)
+            except Exception:
+                self.remove(user_id, websocket)
+
+registry = ConnectionRegistry()
+
+class InProcessBroker:
+    """Delivers events to sockets on this worker only."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        self._loop = None
+
+    def publish(self, user_id: str, event: Dict[str, Any]):
+        # Called from request handlers on the threadpool; hop onto the loop
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(
+            lambda: asyncio.ensure_future(registry.send(user_id, event))
+        )
+
+class RedisBroker:
+    """Fans events out to every worker through a Redis pub/sub channel."""
+
+    channel = "trumpet:realtime"
+
+    def __init__(self, url: str):
+        import redis
+
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def publish(self, user_id: str, event: Dict[str, Any]):
+        self._client.publish(self.channel, json.dumps({"user_id": user_id, "event": event}))
+
+    async def _listen(self):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self._url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                payload = json.loads(message["data"])
+                await registry.send(payload["user_id"], payload["event"])
+        finally:
+            await pubsub.close()
+            await client.close()
+
+broker = RedisBroker(settings.REDIS_URL) if settings.REDIS_URL else InProcessBroker()
+
+def publish(user_id: str, event_type: str, data: Dict[str, Any]):
+    """Push an event to a user's open sockets; call after the write commits."""
+    try:
+        broker.publish(user_id, {"type": event_type, "data": data})
+    except Exception:
+        # Real-time delivery is best effort; clients still catch up by listing
+        logger.exception("Failed to publish %s event", event_type)
@@ -0,0 +1,198 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import Float, String, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.user import User
+
+# Fields matched by user search, most significant first
+SEARCH_FIELDS = ["username", "first_name", "last_name", "occupation", "location"]
+# Fields matched by job search, most significant first
+JOB_SEARCH_FIELDS = ["title", "company", "requirements", "description"]
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+def _fts_match(terms: List[str]) -> str:
+    # Every term must match, the last one as a prefix for typeahead
+    match = " AND ".join(f'"{term}"' for term in terms[:-1])
+    return (match + " AND " if match else "") + f'"{terms[-1]}"*'
+
+def _tsquery(terms: List[str]) -> str:
+    return " & ".join(terms[:-1] + [terms[-1] + ":*"])
+
+class SQLiteUserSearch:
+    """FTS5 index over the searchable user fields, kept in users_fts (see migrations)."""
+
+    def index_user(self, db: Session, user: User):
+        db.execute(text("DELETE FROM users_fts WHERE user_id = :user_id"), {"user_id": user.id})
+        db.execute(
+            text(
+                "INSERT INTO users_fts (user_id, " + ", ".join(SEARCH_FIELDS) + ") "
+                "VALUES (:user_id, " + ", ".join(f":{field}" for field in SEARCH_FIELDS) + ")"
+            ),
+            {"user_id": user.id, **{field: getattr(user, field) for field in SEARCH_FIELDS}}
+        )
+
+    def rebuild(self, db: Session) -> int:
+        db.execute(text("DELETE FROM users_fts"))
+        result = db.execute(text(
+            "INSERT INTO users_fts (user_id, " + ", ".join(SEARCH_FIELDS) + ") "
+            "SELECT id, " + ", ".join(SEARCH_FIELDS) + " FROM users"
+        ))
+        return result.rowcount
+
+    def search(self, db: Session, query: str, skip: int, limit: int) -> List[str]:
+        terms = _terms(query)
+        if not terms:
+            return []
+        rows = db.execute(
+            text(
+                "SELECT user_id FROM users_fts WHERE users_fts MATCH :match "
+                "ORDER BY bm25(users_fts, 0, 10.0, 5.0, 5.0, 2.0, 1.0) "
+                "LIMIT :limit OFFSET :skip"
+            ),
+            {"match": _fts_match(terms), "limit": limit, "skip": skip}
+        )
+        return [row[0] for row in rows]
+
+class PostgresUserSearch:
+    """tsvector generated column on users with a GIN index (see migrations)."""
+
+    def index_user(self, db: Session, user: User):
+        # The generated column is maintained by Postgres
+        pass
+
+    def rebuild(self, db: Session) -> int:
+        return 0
+
+    def search(self, db: Session, query: str, skip: int, limit: int) -> List[str]:
+        terms = _terms(query)
+        if not terms:
+            return []
+        rows = db.execute(
+            text(
+                "SELECT id FROM users, to_tsquery('simple', :tsquery) AS q "
+                "WHERE search_vector @@ q "
+                "ORDER BY ts_rank(search_vector, q) DESC, created_at DESC "
+                "LIMIT :limit OFFSET :skip"
+            ),
+            {"tsquery": _tsquery(terms), "limit": limit, "skip": skip}
+        )
+        return [row[0] for row in rows]
+
+class LikeUserSearch:
+    """Substring matching for databases without a full-text backend."""
+
+    def index_user(self, db: Session, user: User):
+        pass
+
+    def rebuild(self, db: Session) -> int:
+        return 0
+
+    def search(self, db: Session, query: str, skip: int, limit: int) -> List[str]:
+        rows = db.query(User.id).filter(
+            or_(*[getattr(User, field).ilike(f"%{query}%") for field in SEARCH_FIELDS])
+        ).order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+        return [row[0] for row in rows]
+
+def _job_text(job: Job, field: str) -> Optional[str]:
+    value = getattr(job, field)
+    # requirements is a JSON list
+    return " ".join(value) if isinstance(value, list) else value
+
+class SQLiteJobSearch:
+    """FTS5 index over the searchable job fields, kept in jobs_fts (see migrations)."""
+
+    def index_job(self, db: Session, job: Job):
+        db.execute(text("DELETE FROM jobs_fts WHERE job_id = :job_id"), {"job_id": job.id})
+        db.execute(
+            text(
+                "INSERT INTO jobs_fts (job_id, " + ", ".join(JOB_SEARCH_FIELDS) + ") "
+                "VALUES (:job_id, " + ", ".join(f":{field}" for field in JOB_SEARCH_FIELDS) + ")"
+            ),
+            {"job_id": job.id, **{field: _job_text(job, field) for field in JOB_SEARCH_FIELDS}}
+        )
+
+    def rebuild(self, db: Session) -> int:
+        db.execute(text("DELETE FROM jobs_fts"))
+        result = db.execute(text(
+            "INSERT INTO jobs_fts (job_id, " + ", ".join(JOB_SEARCH_FIELDS) + ") "
+            "SELECT id, " + ", ".join(JOB_SEARCH_FIELDS) + " FROM jobs"
+        ))
+        return result.rowcount
+
+    def matches(self, terms: List[str]):
+        return text(
+            "SELECT job_id, bm25(jobs_fts, 0, 10.0, 5.0, 2.0, 1.0) AS rank "
+            "FROM jobs_fts WHERE jobs_fts MATCH :match"
+        ).bindparams(match=_fts_match(terms)).columns(job_id=String, rank=Float)
+
+class PostgresJobSearch:
+    """tsvector generated column on jobs with a GIN index (see migrations)."""
+
+    def index_job(self, db: Session, job: Job):
+        # The generated column is maintained by Postgres
+        pass
+
+    def rebuild(self, db: Session) -> int:
+        return 0
+
+    def matches(self, terms: List[str]):
+        return text(
+            "SELECT id AS job_id, -ts_rank(search_vector, q) AS rank "
+            "FROM jobs, to_tsquery('simple', :tsquery) AS q WHERE search_vector @@ q"
+        ).bindparams(tsquery=_tsquery(terms)).columns(job_id=String, rank=Float)
+
+class LikeJobSearch:
+    """Substring matching for databases without a full-text backend."""
+
+    def index_job(self, db: Session, job: Job):
+        pass
+
+    def rebuild(self, db: Session) -> int:
+        return 0
+
+    def matches(self, terms: List[str]):
+        return select(Job.id.label("job_id"), literal(0.0).label("rank")).where(
+            *[or_(*[getattr(Job, field).ilike(f"%{term}%") for field in JOB_SEARCH_FIELDS]) for term in terms]
+        )
+
+_backends = {
+    "sqlite": SQLiteUserSearch(),
+    "postgresql": PostgresUserSearch(),
+}
+
+_job_backends = {
+    "sqlite": SQLiteJobSearch(),
+    "postgresql": PostgresJobSearch(),
+}
+
+def get_user_search(bind):
+    """Pick the search backend for an engine or connection's dialect."""
+    return _backends.get(bind.dialect.name, LikeUserSearch())
+
+def get_job_search(bind):
+    """Pick the job search backend for an engine or connection's dialect."""
+    return _job_backends.get(bind.dialect.name, LikeJobSearch())
+
+def index_user(db: Session, user: User):
+    """Refresh a user's search entry; runs in the caller's transaction."""
+    get_user_search(db.get_bind()).index_user(db, user)
+
+def search_user_ids(db: Session, query: str, skip: int, limit: int) -> List[str]:
+    """Ids of users matching query, best match first."""
+    return get_user_search(db.get_bind()).search(db, query, skip, limit)
+
+def index_job(db: Session, job: Job):
+    """Refresh a job's search entry; runs in the caller's transaction."""
+    get_job_search(db.get_bind()).index_job(db, job)
+
+def job_matches(db: Session, query: str) -> Optional[object]:
+    """Subquery of (job_id, rank) for jobs matching query, lower rank first; None if query has no terms."""
+    terms = _terms(query)
+    if not terms:
+        return None
+    return get_job_search(db.get_bind()).matches(terms).subquery("matches")
@@ -0,0 +1,114 @@
+import random
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import desc, func, insert, literal, or_, select, tuple_, union
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.pagination import keyset_before
+from app.models.connection import Connection
+from app.models.post import Post
+from app.models.timeline import TimelineEntry
+from app.models.user import User
+
+def _connection_selects(user_id: str):
+    """Both directions of a user's accepted connections."""
+    return [
+        select(Connection.receiver_id.label("user_id")).where(
+            Connection.requester_id == user_id, Connection.status == "accepted"
+        ),
+        select(Connection.requester_id.label("user_id")).where(
+            Connection.receiver_id == user_id, Connection.status == "accepted"
+        )
+    ]
+
+def _audience(author: User):
+    """Users whose timelines show the author's posts, including the author."""
+    return union(
+        select(literal(author.id).label("user_id")),
+        *_connection_selects(author.id),
+        select(User.id.label("user_id")).where(User.occupation == author.occupation)
+    ).subquery()
+
+def fan_out_post(db: Session, post: Post, author: User):
+    """Copy a new post into its audience's timelines; runs in the caller's transaction.
+
+    Authors with more than TIMELINE_FANOUT_LIMIT readers are skipped and their
+    posts are pulled in by read_timeline instead.
+    """
+    audience = _audience(author)
+    audience_size = db.execute(select(func.count()).select_from(audience)).scalar()
+    if audience_size > settings.TIMELINE_FANOUT_LIMIT:
+        db.query(Post).filter(Post.id == post.id).update({"fanned_out": False}, synchronize_session=False)
+        return
+
+    db.execute(insert(TimelineEntry).from_select(
+        ["user_id", "post_id", "created_at"],
+        select(
+            audience.c.user_id,
+            literal(post.id),
+            select(Post.created_at).where(Post.id == post.id).scalar_subquery()
+        )
+    ))
+
+    # Trimming every timeline on every post would cost O(audience * length),
+    # so it runs on a sample of writes and timelines overshoot by a few posts
+    if random.randrange(settings.TIMELINE_TRIM_EVERY) == 0:
+        ranked = select(
+            TimelineEntry.user_id,
+            TimelineEntry.post_id,
+            func.row_number().over(
+                partition_by=TimelineEntry.user_id,
+                order_by=(desc(TimelineEntry.created_at), desc(TimelineEntry.post_id))
+            ).label("rank")
+        ).where(TimelineEntry.user_id.in_(select(audience.c.user_id))).subquery()
+        db.query(TimelineEntry).filter(
+            tuple_(TimelineEntry.user_id, TimelineEntry.post_id).in_(
+                select(ranked.c.user_id, ranked.c.post_id).where(ranked.c.rank > settings.TIMELINE_MAX_LENGTH)
+            )
+        ).delete(synchronize_session=False)
+
+def read_timeline(
+    db: Session,
+    user: User,
+    limit: int,
+    position: Optional[Tuple[datetime, str]] = None
+) -> Tuple[List[Post], bool]:
+    """A page of the user's home timeline, newest first, and whether more follow."""
+    dialect_name = db.get_bind().dialect.name
+
+    materialized = db.query(TimelineEntry.post_id, TimelineEntry.created_at).filter(
+        TimelineEntry.user_id == user.id
+    )
+    # Posts from authors too big to fan out
+    pulled = db.query(Post.id, Post.created_at).join(User, Post.author_id == User.id).filter(
+        Post.fanned_out == False,
+        or_(
+            User.occupation == user.occupation,
+            Post.author_id == user.id,
+            Post.author_id.in_(union(*_connection_selects(user.id)))
+        )
+    )
+    if position:
+        materialized = materialized.filter(
+            keyset_before(TimelineEntry.created_at, TimelineEntry.post_id, position, dialect_name)
+        )
+        pulled = pulled.filter(keyset_before(Post.created_at, Post.id, position, dialect_name))
+
+    candidates = set(
+        materialized.order_by(desc(TimelineEntry.created_at), desc(TimelineEntry.post_id)).limit(limit + 1).all()
+    )
+    candidates.update(pulled.order_by(desc(Post.created_at), desc(Post.id)).limit(limit + 1).all())
+    page = sorted(candidates, key=lambda row: (row[1], row[0]), reverse=True)[:limit + 1]
+    has_more = len(page) > limit
+    post_ids = [post_id for post_id, _ in page[:limit]]
+    if not post_ids:
+        return [], False
+
+    # One batched hydration for the whole page
+    posts_by_id = {
+        post.id: post
+        for post in db.query(Post).options(joinedload(Post.author)).filter(Post.id.in_(post_ids))
+    }
+    return [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id], has_more
@@ -0,0 +1,36 @@
+from app.core.database import SessionLocal
+from app.core.tasks import backend, task
+from app.models.post import Post
+from app.models.user import User
+from app.services.search import index_user
+from app.services.timeline import fan_out_post
+
+# Celery workers load this module: `celery -A app.tasks worker -Q timeline,search`
+celery_app = getattr(backend, "app", None)
+
+@task(queue="timeline")
+def fan_out_post_task(post_id: str):
+    """Copy a committed post into its audience's timelines."""
+    db = SessionLocal()
+    try:
+        post = db.query(Post).filter(Post.id == post_id).first()
+        if post is None:
+            return
+        author = db.query(User).filter(User.id == post.author_id).first()
+        fan_out_post(db, post, author)
+        db.commit()
+    finally:
+        db.close()
+
+@task(queue="search")
+def index_user_task(user_id: str):
+    """Refresh a user's search entry from the committed row."""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return
+        index_user(db, user)
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Backfill denormalized data for Trumpet API
+
+Usage: python backfill.py {post-counters,conversations,search-index,interests,timelines,notification-counters,event-counters,job-facets,geocode,sqlite-replicas}
+"""
+import argparse
+import sqlite3
+
+from sqlalchemy import desc, func, insert, literal, select, union_all
+from sqlalchemy.orm import joinedload
+
+from app.core.database import SessionLocal, replicas
+from app.models.user import User, UserInterest
+from app.models.post import Post, Comment, Like
+from app.models.message import Message
+from app.models.conversation import Conversation
+from app.models.event import Event, EventAttendee
+from app.models.job import Job, JobFacet
+from app.models.timeline import TimelineEntry
+from app.models.notification import Notification, NotificationCounter
+from app.services.conversations import count_unread
+from app.services.geo import set_location
+from app.services.job_facets import FACETS
+from app.services.search import get_job_search, get_user_search
+from app.services.interests import normalize_interests
+from app.services.timeline import fan_out_post
+
+def backfill_post_counters(db):
+    """Recompute posts.likes_count / comments_count from likes and comments"""
+    likes = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+    comments = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+    updated = db.query(Post).update(
+        {Post.likes_count: likes, Post.comments_count: comments}, synchronize_session=False
+    )
+    db.commit()
+    print(f"✅ Recounted likes and comments for {updated} posts")
+
+def backfill_conversations(db):
+    """Rebuild the conversations table from messages"""
+    sent = select(
+        Message.sender_id.label("user_id"),
+        Message.receiver_id.label("partner_id"),
+        Message.id.label("message_id"),
+        Message.created_at.label("created_at")
+    )
+    received = select(
+        Message.receiver_id,
+        Message.sender_id,
+        Message.id,
+        Message.created_at
+    ).where(Message.receiver_id != Message.sender_id)
+    both = union_all(sent, received).subquery()
+    
+    ranked = select(
+        both.c.user_id,
+        both.c.partner_id,
+        both.c.message_id,
+        both.c.created_at,
+        func.row_number().over(
+            partition_by=(both.c.user_id, both.c.partner_id),
+            order_by=(desc(both.c.created_at), desc(both.c.message_id))
+        ).label("rank")
+    ).subquery()
+    
+    db.query(Conversation).delete(synchronize_session=False)
+    result = db.execute(insert(Conversation).from_select(
+        ["user_id", "partner_id", "last_message_id", "last_message_at"],
+        select(
+            ranked.c.user_id,
+            ranked.c.partner_id,
+            ranked.c.message_id,
+            ranked.c.created_at
+        ).where(ranked.c.rank == 1)
+    ))
+    
+    # Start each read watermark at the newest message flagged as read
+    newest_read = select(Message).where(
+        Message.sender_id == Conversation.partner_id,
+        Message.receiver_id == Conversation.user_id,
+        Message.is_read == True
+    ).order_by(desc(Message.created_at), desc(Message.id)).limit(1)
+    db.query(Conversation).update({
+        Conversation.last_read_at: newest_read.with_only_columns(Message.created_at).scalar_subquery(),
+        Conversation.last_read_message_id: newest_read.with_only_columns(Message.id).scalar_subquery()
+    }, synchronize_session=False)
+    db.query(Conversation).update({Conversation.unread_count: count_unread()}, synchronize_session=False)
+    db.commit()
+    print(f"✅ Rebuilt {result.rowcount} conversations")
+
+def backfill_search_index(db):
+    """Rebuild the user and job search indexes from the users and jobs tables"""
+    users = get_user_search(db.get_bind()).rebuild(db)
+    jobs = get_job_search(db.get_bind()).rebuild(db)
+    db.commit()
+    print(f"✅ Indexed {users} users and {jobs} jobs for search")
+
+def backfill_interests(db, batch_size=1000):
+    """Populate user_interests from the JSON interests column"""
+    db.query(UserInterest).delete(synchronize_session=False)
+    users = 0
+    batch = []
+    for user_id, interests in db.query(User.id, User.interests).yield_per(batch_size):
+        users += 1
+        batch.extend(
+            {"user_id": user_id, "interest": interest}
+            for interest in normalize_interests(interests or [])
+        )
+        if len(batch) >= batch_size:
+            db.execute(insert(UserInterest), batch)
+            batch = []
+    if batch:
+        db.execute(insert(UserInterest), batch)
+    db.commit()
+    print(f"✅ Migrated interests for {users} users")
+
+def backfill_timelines(db, batch_size=500):
+    """Rebuild home timelines by fanning out existing posts, oldest first"""
+    db.query(TimelineEntry).delete(synchronize_session=False)
+    post_ids = [row[0] for row in db.query(Post.id).order_by(Post.created_at, Post.id)]
+    for start in range(0, len(post_ids), batch_size):
+        batch = db.query(Post).options(joinedload(Post.author)).filter(
+            Post.id.in_(post_ids[start:start + batch_size])
+        ).order_by(Post.created_at, Post.id).all()
+        for post in batch:
+            fan_out_post(db, post, post.author)
+        db.commit()
+        db.expunge_all()
+    print(f"✅ Fanned out {len(post_ids)} posts")
+
+def backfill_notification_counters(db):
+    """Recount unread notifications per user"""
+    db.query(NotificationCounter).delete(synchronize_session=False)
+    result = db.execute(insert(NotificationCounter).from_select(
+        ["user_id", "unread_count"],
+        select(Notification.user_id, func.count(Notification.id)).where(
+            Notification.is_read == False
+        ).group_by(Notification.user_id)
+    ))
+    db.commit()
+    print(f"✅ Recounted unread notifications for {result.rowcount} users")
+
+def backfill_event_counters(db):
+    """Recount events' attending / maybe / waitlisted attendees"""
+    def status_count(status):
+        return select(func.count(EventAttendee.id)).where(
+            EventAttendee.event_id == Event.id, EventAttendee.status == status
+        ).scalar_subquery()
+    updated = db.query(Event).update({
+        Event.attending_count: status_count("attending"),
+        Event.maybe_count: status_count("maybe"),
+        Event.waitlisted_count: status_count("waitlisted"),
+    }, synchronize_session=False)
+    db.commit()
+    print(f"✅ Recounted attendees for {updated} events")
+
+def backfill_job_facets(db):
+    """Recount active jobs per facet value"""
+    db.query(JobFacet).delete(synchronize_session=False)
+    columns = {"type": Job.type, "location": Job.location, "occupation": Job.poster_occupation}
+    values = 0
+    for facet in FACETS:
+        result = db.execute(insert(JobFacet).from_select(
+            ["facet", "value", "count"],
+            select(literal(facet), columns[facet], func.count(Job.id)).where(
+                Job.is_active == True, columns[facet].isnot(None)
+            ).group_by(columns[facet])
+        ))
+        values += result.rowcount
+    db.commit()
+    print(f"✅ Recounted {values} job facet values")
+
+def backfill_geocode(db, batch_size=500):
+    """Fill coordinates and geohashes for users, events and jobs that have none"""
+    for model in (User, Event, Job):
+        ids = [row[0] for row in db.query(model.id).filter(model.geohash.is_(None))]
+        located = 0
+        for start in range(0, len(ids), batch_size):
+            for row in db.query(model).filter(model.id.in_(ids[start:start + batch_size])):
+                set_location(db, row, row.latitude, row.longitude)
+                located += row.geohash is not None
+            db.commit()
+            db.expunge_all()
+        print(f"✅ Located {located} of {len(ids)} {model.__tablename__}")
+
+def backfill_sqlite_replicas(db):
+    """Copy a SQLite primary into each SQLite replica file, standing in for replication locally"""
+    source = db.connection().connection.driver_connection
+    copied = 0
+    for replica in replicas.engines:
+        if replica.dialect.name != "sqlite":
+            continue
+        replica.dispose()
+        target = sqlite3.connect(replica.url.database)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+        copied += 1
+    print(f"✅ Copied the primary into {copied} SQLite replicas")
+
+COMMANDS = {
+    "post-counters": backfill_post_counters,
+    "conversations": backfill_conversations,
+    "search-index": backfill_search_index,
+    "interests": backfill_interests,
+    "timelines": backfill_timelines,
+    "notification-counters": backfill_notification_counters,
+    "event-counters": backfill_event_counters,
+    "job-facets": backfill_job_facets,
+    "geocode": backfill_geocode,
+    "sqlite-replicas": backfill_sqlite_replicas,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill denormalized data")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        COMMANDS[args.command](db)
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
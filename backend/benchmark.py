@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Concurrent-request benchmark for a running Trumpet API
+
+Usage: python benchmark.py [--url http://localhost:8000/api/posts/] [--concurrency 32] [--requests 2000]
+       python benchmark.py --startup [--url http://localhost:8000/api/posts/] [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def timed_request(url, headers):
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - started
+
+def run(url, concurrency, total, headers):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Warm up connections and caches
+        list(pool.map(lambda _: timed_request(url, headers), range(concurrency)))
+
+        started = time.perf_counter()
+        latencies = list(pool.map(lambda _: timed_request(url, headers), range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000
+    }
+
+def measure_startup(url, runs):
+    """Launch uvicorn repeatedly and time boot-to-ready and the first request."""
+    parsed = urllib.parse.urlparse(url)
+    health_url = f"{parsed.scheme}://{parsed.netloc}/api/health"
+    boots, first_requests, warm_requests = [], [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(parsed.port or 8000)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            while True:
+                try:
+                    timed_request(health_url, {})
+                    break
+                except (urllib.error.URLError, ConnectionError):
+                    if server.poll() is not None:
+                        raise RuntimeError("uvicorn exited during startup")
+                    time.sleep(0.01)
+            boots.append(time.perf_counter() - started)
+            first_requests.append(timed_request(url, {}))
+            warm_requests.append(statistics.median(timed_request(url, {}) for _ in range(20)))
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        "boot": statistics.median(boots) * 1000,
+        "first": statistics.median(first_requests) * 1000,
+        "warm": statistics.median(warm_requests) * 1000
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure concurrent-request throughput")
+    parser.add_argument("--url", default="http://localhost:8000/api/posts/")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints")
+    parser.add_argument("--startup", action="store_true", help="Measure cold start instead of throughput")
+    parser.add_argument("--runs", type=int, default=5, help="Server launches for --startup")
+    args = parser.parse_args()
+
+    if args.startup:
+        print(f"🚀 Starting the API {args.runs} times and requesting {args.url}")
+        result = measure_startup(args.url, args.runs)
+        print(f"✅ boot to ready {result['boot']:.0f} ms, first request {result['first']:.1f} ms, "
+              f"warm request {result['warm']:.1f} ms")
+        sys.exit(0)
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    print(f"🚀 {args.requests} requests to {args.url} with concurrency {args.concurrency}")
+    result = run(args.url, args.concurrency, args.requests, headers)
+    print(f"✅ {result['throughput']:.1f} req/s, p50 {result['p50']:.1f} ms, p99 {result['p99']:.1f} ms")
@@ -0,0 +1,64 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Postgres-only indexes created with raw DDL
+MIGRATION_ONLY_INDEXES = {
+    "ix_users_search_vector", "ix_jobs_search_vector", "ix_jobs_requirements", "ix_jobs_benefits"
+}
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The search indexes are raw DDL owned by the migrations, not by app/models
+    if type_ == "table" and name.startswith(("users_fts", "jobs_fts")):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name in MIGRATION_ONLY_INDEXES:
+        return False
+    return True
+
+def _url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to a database."""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    """Apply migrations over a single unpooled connection."""
+    connectable = create_engine(_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        # Batch mode lets ALTERs run on SQLite by copying the table
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,246 @@
+"""denormalized read models
+
+Adds what the read paths grew on top of the initial schema and fills it from
+existing rows: posts.likes_count / comments_count, the conversations inbox,
+user_interests, notification_counters with notification grouping, home
+timelines (posts.fanned_out and timeline_entries), the messages indexes the
+inbox reads, and the users search index (an FTS5 table on SQLite, a generated
+tsvector column with a GIN index on Postgres).
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+SEARCH_FIELDS = ["username", "first_name", "last_name", "occupation", "location"]
+# Defaults of settings.TIMELINE_FANOUT_LIMIT / TIMELINE_MAX_LENGTH
+TIMELINE_FANOUT_LIMIT = 5000
+TIMELINE_MAX_LENGTH = 500
+
+# (author_id, user_id) for every user whose timeline shows the author's posts;
+# matches app/services/timeline.py _audience
+AUDIENCE = (
+    "SELECT id AS author_id, id AS user_id FROM users "
+    "UNION SELECT requester_id, receiver_id FROM connections WHERE status = 'accepted' "
+    "UNION SELECT receiver_id, requester_id FROM connections WHERE status = 'accepted' "
+    "UNION SELECT authors.id, readers.id FROM users authors "
+    "JOIN users readers ON readers.occupation = authors.occupation"
+)
+
+# Both sides of every message, newest first per (user, partner)
+CONVERSATION_MESSAGES = (
+    "SELECT user_id, partner_id, message_id, created_at, ROW_NUMBER() OVER ("
+    "PARTITION BY user_id, partner_id ORDER BY created_at DESC, message_id DESC) AS rank FROM ("
+    "SELECT sender_id AS user_id, receiver_id AS partner_id, id AS message_id, created_at FROM messages "
+    "UNION ALL SELECT receiver_id, sender_id, id, created_at FROM messages WHERE receiver_id <> sender_id"
+    ") AS both_sides"
+)
+
+UNREAD = (
+    "SELECT COUNT(*) FROM messages m "
+    "WHERE m.sender_id = conversations.partner_id AND m.receiver_id = conversations.user_id "
+    "AND conversations.user_id <> conversations.partner_id AND NOT m.is_read"
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_receiver_is_read', ['receiver_id', 'is_read'], unique=False)
+        batch_op.create_index('ix_messages_sender_receiver_created', ['sender_id', 'receiver_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('group_key', sa.String(), nullable=True))
+        batch_op.create_index('ix_notifications_user_group_read', ['user_id', 'group_key', 'is_read'], unique=False)
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comments_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('fanned_out', sa.Boolean(), server_default=sa.true(), nullable=False))
+        batch_op.create_index('ix_posts_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_posts_fanned_out_created_at', ['fanned_out', 'created_at', 'id'], unique=False)
+
+    op.create_table('notification_counters',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('user_interests',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('interest', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'interest')
+    )
+    with op.batch_alter_table('user_interests', schema=None) as batch_op:
+        batch_op.create_index('ix_user_interests_interest_user', ['interest', 'user_id'], unique=False)
+
+    op.create_table('conversations',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('partner_id', sa.String(), nullable=False),
+    sa.Column('last_message_id', sa.String(), nullable=False),
+    sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['messages.id'], ),
+    sa.ForeignKeyConstraint(['partner_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'partner_id')
+    )
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.create_index('ix_conversations_user_last_message_at', ['user_id', 'last_message_at'], unique=False)
+
+    op.create_table('timeline_entries',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('post_id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    with op.batch_alter_table('timeline_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_timeline_entries_user_created_post', ['user_id', 'created_at', 'post_id'], unique=False)
+
+    _backfill_post_counters()
+    _backfill_conversations()
+    _backfill_interests()
+    _backfill_notification_counters()
+    _backfill_timelines()
+    _create_search_index()
+
+
+def downgrade() -> None:
+    _drop_search_index()
+    with op.batch_alter_table('timeline_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_timeline_entries_user_created_post')
+
+    op.drop_table('timeline_entries')
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_index('ix_conversations_user_last_message_at')
+
+    op.drop_table('conversations')
+    with op.batch_alter_table('user_interests', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_interests_interest_user')
+
+    op.drop_table('user_interests')
+    op.drop_table('notification_counters')
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_fanned_out_created_at')
+        batch_op.drop_index('ix_posts_created_at_id')
+        batch_op.drop_column('fanned_out')
+        batch_op.drop_column('comments_count')
+        batch_op.drop_column('likes_count')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_group_read')
+        batch_op.drop_column('group_key')
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_sender_receiver_created')
+        batch_op.drop_index('ix_messages_receiver_is_read')
+
+
+def _backfill_post_counters() -> None:
+    op.execute(
+        "UPDATE posts SET "
+        "likes_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id), "
+        "comments_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+
+
+def _backfill_conversations() -> None:
+    op.execute(
+        "INSERT INTO conversations (user_id, partner_id, last_message_id, last_message_at) "
+        f"SELECT user_id, partner_id, message_id, created_at FROM ({CONVERSATION_MESSAGES}) AS ranked "
+        "WHERE rank = 1"
+    )
+    op.execute(f"UPDATE conversations SET unread_count = ({UNREAD})")
+
+
+def _backfill_interests() -> None:
+    # users.interests is a JSON list in a text column; normalized as
+    # app/services/interests.py normalize_interests does
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        elements = "users, json_each(users.interests) AS element WHERE json_valid(users.interests)"
+    else:
+        elements = (
+            "users CROSS JOIN LATERAL json_array_elements_text(CASE WHEN json_typeof(users.interests::json) = 'array' "
+            "THEN users.interests::json ELSE '[]'::json END) AS element(value)"
+        )
+    op.execute(
+        "INSERT INTO user_interests (user_id, interest) "
+        "SELECT DISTINCT user_id, interest FROM ("
+        f"SELECT users.id AS user_id, lower(trim(element.value)) AS interest FROM {elements}"
+        ") AS normalized WHERE interest <> ''"
+    )
+
+
+def _backfill_notification_counters() -> None:
+    op.execute(
+        "INSERT INTO notification_counters (user_id, unread_count) "
+        "SELECT user_id, COUNT(*) FROM notifications WHERE NOT is_read GROUP BY user_id"
+    )
+
+
+def _backfill_timelines() -> None:
+    # Authors with more readers than the fan-out limit are served on read, as
+    # app/services/timeline.py fan_out_post does for new posts
+    op.execute(
+        sa.text(
+            "UPDATE posts SET fanned_out = :fanned_out WHERE author_id IN ("
+            f"SELECT author_id FROM ({AUDIENCE}) AS audience GROUP BY author_id HAVING COUNT(*) > :limit)"
+        ).bindparams(fanned_out=False, limit=TIMELINE_FANOUT_LIMIT)
+    )
+    op.execute(
+        sa.text(
+            "INSERT INTO timeline_entries (user_id, post_id, created_at) "
+            "SELECT user_id, post_id, created_at FROM ("
+            "SELECT audience.user_id, posts.id AS post_id, posts.created_at, ROW_NUMBER() OVER ("
+            "PARTITION BY audience.user_id ORDER BY posts.created_at DESC, posts.id DESC) AS rank "
+            f"FROM posts JOIN ({AUDIENCE}) AS audience ON audience.author_id = posts.author_id "
+            "WHERE posts.fanned_out AND posts.created_at IS NOT NULL"
+            ") AS ranked WHERE rank <= :length"
+        ).bindparams(length=TIMELINE_MAX_LENGTH)
+    )
+
+
+def _create_search_index() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE users_fts USING fts5("
+            "user_id UNINDEXED, " + ", ".join(SEARCH_FIELDS) + ", "
+            "tokenize = 'unicode61', prefix = '2 3')"
+        )
+        op.execute(
+            "INSERT INTO users_fts (user_id, " + ", ".join(SEARCH_FIELDS) + ") "
+            "SELECT id, " + ", ".join(SEARCH_FIELDS) + " FROM users"
+        )
+    elif dialect == "postgresql":
+        weights = ["A", "B", "B", "C", "D"]
+        document = " || ".join(
+            f"setweight(to_tsvector('simple', coalesce({field}, '')), '{weight}')"
+            for field, weight in zip(SEARCH_FIELDS, weights)
+        )
+        op.execute(f"ALTER TABLE users ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({document}) STORED")
+        op.execute("CREATE INDEX ix_users_search_vector ON users USING GIN (search_vector)")
+
+
+def _drop_search_index() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS users_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_users_search_vector")
+        op.execute("ALTER TABLE users DROP COLUMN IF EXISTS search_vector")
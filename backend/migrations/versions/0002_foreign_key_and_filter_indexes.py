@@ -0,0 +1,129 @@
+"""foreign key and filter indexes
+
+Indexes every foreign key and the filter/sort columns the routers use, and
+makes likes, event attendance, job applications and connection requests
+unique per pair. Duplicate pairs left by earlier races are removed first,
+keeping the oldest row, and posts.likes_count is recounted to match.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# (table, pair of columns made unique)
+UNIQUE_PAIRS = [
+    ("likes", "post_id", "user_id"),
+    ("event_attendees", "event_id", "user_id"),
+    ("job_applications", "job_id", "user_id"),
+    ("connections", "requester_id", "receiver_id"),
+]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _delete_duplicate_pairs() -> None:
+    for table, first, second in UNIQUE_PAIRS:
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN ("
+            f"SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM {table} GROUP BY {first}, {second}) AS kept)"
+        )
+    op.execute("UPDATE posts SET likes_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id)")
+
+
+def upgrade() -> None:
+    _delete_duplicate_pairs()
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_author_id', ['author_id'], unique=False)
+        batch_op.create_index('ix_comments_post_created_at', ['post_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('connections', schema=None) as batch_op:
+        batch_op.create_index('ix_connections_receiver_status_requester', ['receiver_id', 'status', 'requester_id'], unique=False)
+        batch_op.create_index('ix_connections_requester_status_receiver', ['requester_id', 'status', 'receiver_id'], unique=False)
+        batch_op.create_unique_constraint('uq_connections_requester_receiver', ['requester_id', 'receiver_id'])
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.create_index('ix_event_attendees_user_id', ['user_id'], unique=False)
+        batch_op.create_unique_constraint('uq_event_attendees_event_user', ['event_id', 'user_id'])
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_date', ['date'], unique=False)
+        batch_op.create_index('ix_events_organizer_id', ['organizer_id'], unique=False)
+
+    with op.batch_alter_table('job_applications', schema=None) as batch_op:
+        batch_op.create_index('ix_job_applications_user_id', ['user_id'], unique=False)
+        batch_op.create_unique_constraint('uq_job_applications_job_user', ['job_id', 'user_id'])
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_active_created_at', ['is_active', 'created_at'], unique=False)
+        batch_op.create_index('ix_jobs_active_type_created_at', ['is_active', 'type', 'created_at'], unique=False)
+        batch_op.create_index('ix_jobs_poster_id', ['poster_id'], unique=False)
+
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.create_index('ix_likes_user_id', ['user_id'], unique=False)
+        batch_op.create_unique_constraint('uq_likes_post_user', ['post_id', 'user_id'])
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_created_at', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_notifications_user_read_created_at', ['user_id', 'is_read', 'created_at'], unique=False)
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_author_created_at', ['author_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_users_occupation_created_at', ['occupation', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_occupation_created_at')
+        batch_op.drop_index('ix_users_created_at')
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_author_created_at')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_read_created_at')
+        batch_op.drop_index('ix_notifications_user_created_at')
+
+    with op.batch_alter_table('likes', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_likes_post_user', type_='unique')
+        batch_op.drop_index('ix_likes_user_id')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_poster_id')
+        batch_op.drop_index('ix_jobs_active_type_created_at')
+        batch_op.drop_index('ix_jobs_active_created_at')
+
+    with op.batch_alter_table('job_applications', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_job_applications_job_user', type_='unique')
+        batch_op.drop_index('ix_job_applications_user_id')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_organizer_id')
+        batch_op.drop_index('ix_events_date')
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_event_attendees_event_user', type_='unique')
+        batch_op.drop_index('ix_event_attendees_user_id')
+
+    with op.batch_alter_table('connections', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_connections_requester_receiver', type_='unique')
+        batch_op.drop_index('ix_connections_requester_status_receiver')
+        batch_op.drop_index('ix_connections_receiver_status_requester')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_post_created_at')
+        batch_op.drop_index('ix_comments_author_id')
+
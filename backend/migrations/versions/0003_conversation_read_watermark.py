@@ -0,0 +1,63 @@
+"""conversation read watermark
+
+Replaces conversations.unread_count with a per-conversation read watermark
+(last_read_at, last_read_message_id). Existing conversations start at the
+newest partner message already flagged messages.is_read, which the old
+mark-as-read wrote for every message at once.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEWEST_READ = (
+    "SELECT m.{column} FROM messages m "
+    "WHERE m.sender_id = conversations.partner_id AND m.receiver_id = conversations.user_id AND m.is_read "
+    "ORDER BY m.created_at DESC, m.id DESC LIMIT 1"
+)
+
+UNREAD = (
+    "SELECT COUNT(*) FROM messages m "
+    "WHERE m.sender_id = conversations.partner_id AND m.receiver_id = conversations.user_id "
+    "AND conversations.user_id <> conversations.partner_id "
+    "AND (conversations.last_read_at IS NULL OR m.created_at > conversations.last_read_at "
+    "OR (m.created_at = conversations.last_read_at AND m.id > conversations.last_read_message_id))"
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_read_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('last_read_message_id', sa.String(), nullable=True))
+
+    op.execute(
+        "UPDATE conversations SET "
+        f"last_read_at = ({NEWEST_READ.format(column='created_at')}), "
+        f"last_read_message_id = ({NEWEST_READ.format(column='id')})"
+    )
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('unread_count')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(f"UPDATE conversations SET unread_count = ({UNREAD})")
+
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('last_read_message_id')
+        batch_op.drop_column('last_read_at')
@@ -0,0 +1,56 @@
+"""event attendee counters
+
+Adds per-status attendee counts to events and a waitlist position to
+event_attendees. Counts for existing events are filled from their attendee
+rows; events that were already oversubscribed keep their attendees and take
+no new ones until enough people drop out.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUS_COUNT = "(SELECT COUNT(*) FROM event_attendees a WHERE a.event_id = events.id AND a.status = '{status}')"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('waitlisted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_event_attendees_event_status_waitlisted', ['event_id', 'status', 'waitlisted_at'], unique=False)
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attending_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('maybe_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('waitlisted_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        "UPDATE events SET "
+        f"attending_count = {STATUS_COUNT.format(status='attending')}, "
+        f"maybe_count = {STATUS_COUNT.format(status='maybe')}"
+    )
+
+
+def downgrade() -> None:
+    # Waitlisted attendees become plain sign-ups again, as before the waitlist
+    op.execute("UPDATE event_attendees SET status = 'attending' WHERE status = 'waitlisted'")
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('waitlisted_count')
+        batch_op.drop_column('maybe_count')
+        batch_op.drop_column('attending_count')
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_attendees_event_status_waitlisted')
+        batch_op.drop_column('waitlisted_at')
@@ -0,0 +1,194 @@
+"""geospatial locations
+
+Adds latitude, longitude and a geohash to users, events and jobs, and a places
+table of known cities used to geocode free-text locations without a network
+service. Existing rows are geocoded by `python backfill.py geocode`.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, country, latitude, longitude, population)
+PLACES = [
+    ("Abu Dhabi", "AE", 24.4539, 54.3773, 1480000),
+    ("Dubai", "AE", 25.2048, 55.2708, 3330000),
+    ("Buenos Aires", "AR", -34.6037, -58.3816, 3075000),
+    ("Vienna", "AT", 48.2082, 16.3738, 1920000),
+    ("Melbourne", "AU", -37.8136, 144.9631, 5080000),
+    ("Sydney", "AU", -33.8688, 151.2093, 5260000),
+    ("Brussels", "BE", 50.8503, 4.3517, 1220000),
+    ("Rio de Janeiro", "BR", -22.9068, -43.1729, 6750000),
+    ("Sao Paulo", "BR", -23.5505, -46.6333, 12330000),
+    ("London", "CA", 42.9849, -81.2453, 422000),
+    ("Montreal", "CA", 45.5017, -73.5673, 1760000),
+    ("Toronto", "CA", 43.6532, -79.3832, 2790000),
+    ("Vancouver", "CA", 49.2827, -123.1207, 662000),
+    ("Zurich", "CH", 47.3769, 8.5417, 421000),
+    ("Santiago", "CL", -33.4489, -70.6693, 6260000),
+    ("Beijing", "CN", 39.9042, 116.4074, 21540000),
+    ("Shanghai", "CN", 31.2304, 121.4737, 24870000),
+    ("Bogota", "CO", 4.7110, -74.0721, 7900000),
+    ("Prague", "CZ", 50.0755, 14.4378, 1330000),
+    ("Berlin", "DE", 52.5200, 13.4050, 3645000),
+    ("Frankfurt", "DE", 50.1109, 8.6821, 760000),
+    ("Hamburg", "DE", 53.5511, 9.9937, 1850000),
+    ("Munich", "DE", 48.1351, 11.5820, 1490000),
+    ("Copenhagen", "DK", 55.6761, 12.5683, 640000),
+    ("Cairo", "EG", 30.0444, 31.2357, 10100000),
+    ("Barcelona", "ES", 41.3874, 2.1686, 1620000),
+    ("Madrid", "ES", 40.4168, -3.7038, 3330000),
+    ("Addis Ababa", "ET", 9.0300, 38.7400, 3600000),
+    ("Helsinki", "FI", 60.1699, 24.9384, 660000),
+    ("Lyon", "FR", 45.7640, 4.8357, 520000),
+    ("Paris", "FR", 48.8566, 2.3522, 2160000),
+    ("Birmingham", "GB", 52.4862, -1.8904, 1140000),
+    ("Edinburgh", "GB", 55.9533, -3.1883, 530000),
+    ("Glasgow", "GB", 55.8642, -4.2518, 635000),
+    ("London", "GB", 51.5074, -0.1278, 8980000),
+    ("Manchester", "GB", 53.4808, -2.2426, 550000),
+    ("York", "GB", 53.9600, -1.0873, 210000),
+    ("Accra", "GH", 5.6037, -0.1870, 2510000),
+    ("Athens", "GR", 37.9838, 23.7275, 660000),
+    ("Hong Kong", "HK", 22.3193, 114.1694, 7480000),
+    ("Budapest", "HU", 47.4979, 19.0402, 1750000),
+    ("Jakarta", "ID", -6.2088, 106.8456, 10560000),
+    ("Dublin", "IE", 53.3498, -6.2603, 555000),
+    ("Tel Aviv", "IL", 32.0853, 34.7818, 460000),
+    ("Bangalore", "IN", 12.9716, 77.5946, 8440000),
+    ("Delhi", "IN", 28.7041, 77.1025, 16790000),
+    ("Mumbai", "IN", 19.0760, 72.8777, 12440000),
+    ("Milan", "IT", 45.4642, 9.1900, 1350000),
+    ("Rome", "IT", 41.9028, 12.4964, 2870000),
+    ("Osaka", "JP", 34.6937, 135.5023, 2750000),
+    ("Tokyo", "JP", 35.6762, 139.6503, 13960000),
+    ("Nairobi", "KE", -1.2921, 36.8219, 4400000),
+    ("Seoul", "KR", 37.5665, 126.9780, 9770000),
+    ("Casablanca", "MA", 33.5731, -7.5898, 3360000),
+    ("Mexico City", "MX", 19.4326, -99.1332, 9210000),
+    ("Kuala Lumpur", "MY", 3.1390, 101.6869, 1800000),
+    ("Abuja", "NG", 9.0765, 7.3986, 1240000),
+    ("Lagos", "NG", 6.5244, 3.3792, 14860000),
+    ("Amsterdam", "NL", 52.3676, 4.9041, 870000),
+    ("Oslo", "NO", 59.9139, 10.7522, 700000),
+    ("Auckland", "NZ", -36.8485, 174.7633, 1660000),
+    ("Lima", "PE", -12.0464, -77.0428, 9750000),
+    ("Manila", "PH", 14.5995, 120.9842, 1780000),
+    ("Karachi", "PK", 24.8607, 67.0011, 14910000),
+    ("Warsaw", "PL", 52.2297, 21.0122, 1790000),
+    ("Lisbon", "PT", 38.7223, -9.1393, 505000),
+    ("Bucharest", "RO", 44.4268, 26.1025, 1830000),
+    ("Moscow", "RU", 55.7558, 37.6173, 12500000),
+    ("Riyadh", "SA", 24.7136, 46.6753, 7680000),
+    ("Stockholm", "SE", 59.3293, 18.0686, 975000),
+    ("Singapore", "SG", 1.3521, 103.8198, 5690000),
+    ("Bangkok", "TH", 13.7563, 100.5018, 10540000),
+    ("Istanbul", "TR", 41.0082, 28.9784, 15460000),
+    ("Taipei", "TW", 25.0330, 121.5654, 2650000),
+    ("Kyiv", "UA", 50.4501, 30.5234, 2960000),
+    ("Atlanta", "US", 33.7490, -84.3880, 500000),
+    ("Austin", "US", 30.2672, -97.7431, 980000),
+    ("Boston", "US", 42.3601, -71.0589, 690000),
+    ("Chicago", "US", 41.8781, -87.6298, 2700000),
+    ("Dallas", "US", 32.7767, -96.7970, 1340000),
+    ("Denver", "US", 39.7392, -104.9903, 715000),
+    ("Houston", "US", 29.7604, -95.3698, 2300000),
+    ("Los Angeles", "US", 34.0522, -118.2437, 3900000),
+    ("Miami", "US", 25.7617, -80.1918, 450000),
+    ("New York", "US", 40.7128, -74.0060, 8340000),
+    ("Philadelphia", "US", 39.9526, -75.1652, 1580000),
+    ("Phoenix", "US", 33.4484, -112.0740, 1610000),
+    ("San Diego", "US", 32.7157, -117.1611, 1390000),
+    ("San Francisco", "US", 37.7749, -122.4194, 815000),
+    ("Seattle", "US", 47.6062, -122.3321, 735000),
+    ("Washington", "US", 38.9072, -77.0369, 690000),
+    ("Ho Chi Minh City", "VN", 10.8231, 106.6297, 8990000),
+    ("Cape Town", "ZA", -33.9249, 18.4241, 4620000),
+    ("Johannesburg", "ZA", -26.2041, 28.0473, 5640000),
+]
+
+
+def place_key(name: str) -> str:
+    # Frozen copy of app.services.geo.place_key
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", stripped.lower()))
+
+
+def upgrade() -> None:
+    places = op.create_table('places',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('population', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.create_index('ix_places_name_key_population', ['name_key', 'population'], unique=False)
+
+    op.bulk_insert(places, [
+        {"name": name, "name_key": place_key(name), "country": country,
+         "latitude": latitude, "longitude": longitude, "population": population}
+        for name, country, latitude, longitude, population in PLACES
+    ])
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(), nullable=True))
+        batch_op.create_index('ix_events_geohash', ['geohash'], unique=False)
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(), nullable=True))
+        batch_op.create_index('ix_jobs_geohash', ['geohash'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(), nullable=True))
+        batch_op.create_index('ix_users_geohash', ['geohash'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+
+    with op.batch_alter_table('places', schema=None) as batch_op:
+        batch_op.drop_index('ix_places_name_key_population')
+
+    op.drop_table('places')
@@ -0,0 +1,86 @@
+"""job search and facets
+
+Adds the job_facets table of active-job counts per type, location and poster
+occupation, filled from the existing jobs, and the jobs search index that
+app/services/search.py queries: an FTS5 table on SQLite and a generated
+tsvector column with a GIN index on Postgres.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+JOB_SEARCH_FIELDS = ["title", "company", "requirements", "description"]
+
+FACET_COLUMNS = {"type": "jobs.type", "location": "jobs.location", "occupation": "users.occupation"}
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job_facets',
+    sa.Column('facet', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+    with op.batch_alter_table('job_facets', schema=None) as batch_op:
+        batch_op.create_index('ix_job_facets_facet_count', ['facet', 'count'], unique=False)
+
+    for facet, column in FACET_COLUMNS.items():
+        op.execute(
+            "INSERT INTO job_facets (facet, value, count) "
+            f"SELECT '{facet}', {column}, COUNT(*) FROM jobs JOIN users ON users.id = jobs.poster_id "
+            f"WHERE jobs.is_active GROUP BY {column}"
+        )
+
+    _create_search_index()
+
+
+def downgrade() -> None:
+    _drop_search_index()
+    with op.batch_alter_table('job_facets', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_facets_facet_count')
+
+    op.drop_table('job_facets')
+
+
+def _create_search_index() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+            "job_id UNINDEXED, " + ", ".join(JOB_SEARCH_FIELDS) + ", "
+            "tokenize = 'unicode61', prefix = '2 3')"
+        )
+        op.execute(
+            "INSERT INTO jobs_fts (job_id, " + ", ".join(JOB_SEARCH_FIELDS) + ") "
+            "SELECT id, " + ", ".join(JOB_SEARCH_FIELDS) + " FROM jobs"
+        )
+    elif dialect == "postgresql":
+        weights = ["A", "B", "C", "D"]
+        document = " || ".join(
+            f"setweight(to_tsvector('simple', coalesce({field}, '')), '{weight}')"
+            for field, weight in zip(JOB_SEARCH_FIELDS, weights)
+        )
+        op.execute(f"ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({document}) STORED")
+        op.execute("CREATE INDEX ix_jobs_search_vector ON jobs USING GIN (search_vector)")
+
+
+def _drop_search_index() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+        op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
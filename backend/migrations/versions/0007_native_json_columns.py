@@ -0,0 +1,116 @@
+"""native json columns
+
+Stores jobs.requirements, jobs.benefits, notifications.data and
+users.interests as JSON instead of json.dumps text: JSONB on Postgres, with
+GIN indexes on the job lists for containment queries, and JSON elsewhere.
+
+On Postgres each column is copied into a new jsonb column in keyset batches
+of BATCH_SIZE rows, each committed on its own, and then swapped in; a failed
+run can be re-run and starts the copy over. Run it with the app stopped, as
+start.sh does, so no rows change during the copy. SQLite keeps JSON as text,
+so its rows are already in the stored form and only the declared types
+change.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# (table, column, nullable)
+JSON_COLUMNS = [
+    ("jobs", "requirements", True),
+    ("jobs", "benefits", True),
+    ("notifications", "data", True),
+    ("users", "interests", False),
+]
+BATCH_SIZE = 1000
+
+JOB_SEARCH_FIELDS = ["title", "company", "requirements", "description"]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # The generated search column reads requirements as text
+        _drop_jobs_search_vector()
+        for table, column, nullable in JSON_COLUMNS:
+            _convert_in_batches(table, column, nullable)
+        _create_jobs_search_vector(requirements_default="'[]'::jsonb")
+        op.execute("CREATE INDEX ix_jobs_requirements ON jobs USING GIN (requirements jsonb_path_ops)")
+        op.execute("CREATE INDEX ix_jobs_benefits ON jobs USING GIN (benefits jsonb_path_ops)")
+    else:
+        _alter_types(sa.Text(), sa.JSON())
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_jobs_benefits")
+        op.execute("DROP INDEX IF EXISTS ix_jobs_requirements")
+        _drop_jobs_search_vector()
+        for table, column, _ in JSON_COLUMNS:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text USING {column}::text")
+        _create_jobs_search_vector(requirements_default="''")
+    else:
+        _alter_types(sa.JSON(), sa.Text())
+
+
+def _convert_in_batches(table: str, column: str, nullable: bool) -> None:
+    converted = f"{column}_json"
+    op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {converted} jsonb")
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        last_id = ""
+        while True:
+            ids = bind.execute(
+                sa.text(f"SELECT id FROM {table} WHERE id > :last_id ORDER BY id LIMIT :batch_size"),
+                {"last_id": last_id, "batch_size": BATCH_SIZE}
+            ).scalars().all()
+            if not ids:
+                break
+            bind.execute(
+                sa.text(f"UPDATE {table} SET {converted} = CAST({column} AS jsonb) WHERE id > :last_id AND id <= :upper"),
+                {"last_id": last_id, "upper": ids[-1]}
+            )
+            last_id = ids[-1]
+    op.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+    op.execute(f"ALTER TABLE {table} RENAME COLUMN {converted} TO {column}")
+    if not nullable:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+
+
+def _alter_types(existing_type, type_) -> None:
+    tables = {}
+    for table, column, nullable in JSON_COLUMNS:
+        tables.setdefault(table, []).append((column, nullable))
+    for table, columns in tables.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column, nullable in columns:
+                batch_op.alter_column(column, existing_type=existing_type, type_=type_, existing_nullable=nullable)
+
+
+def _drop_jobs_search_vector() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
+
+
+def _create_jobs_search_vector(requirements_default: str) -> None:
+    weights = ["A", "B", "C", "D"]
+    defaults = {field: "''" for field in JOB_SEARCH_FIELDS}
+    defaults["requirements"] = requirements_default
+    document = " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({field}, {defaults[field]})), '{weight}')"
+        for field, weight in zip(JOB_SEARCH_FIELDS, weights)
+    )
+    op.execute(f"ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({document}) STORED")
+    op.execute("CREATE INDEX ix_jobs_search_vector ON jobs USING GIN (search_vector)")
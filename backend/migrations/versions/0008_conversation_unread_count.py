@@ -0,0 +1,42 @@
+"""conversation unread count
+
+Stores conversations.unread_count again, next to the read watermark, so the
+inbox reads it instead of counting messages per row. Existing conversations
+are counted from the partner's messages past their watermark.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNREAD = (
+    "SELECT COUNT(*) FROM messages m "
+    "WHERE m.sender_id = conversations.partner_id AND m.receiver_id = conversations.user_id "
+    "AND conversations.user_id <> conversations.partner_id "
+    "AND (conversations.last_read_at IS NULL OR m.created_at > conversations.last_read_at "
+    "OR (m.created_at = conversations.last_read_at AND m.id > conversations.last_read_message_id))"
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(f"UPDATE conversations SET unread_count = ({UNREAD})")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('conversations', schema=None) as batch_op:
+        batch_op.drop_column('unread_count')
@@ -0,0 +1,45 @@
+"""job poster occupation
+
+Stores the poster's occupation on each job, so the occupation facet count a
+job adds when it becomes active is the one it removes when deactivated, even
+after the poster edits their profile. Existing jobs take their poster's
+current occupation and job_facets is recounted to match.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACET_COLUMNS = {"type": "type", "location": "location", "occupation": "poster_occupation"}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('poster_occupation', sa.String(), nullable=True))
+
+    op.execute("UPDATE jobs SET poster_occupation = (SELECT occupation FROM users WHERE users.id = jobs.poster_id)")
+
+    op.execute("DELETE FROM job_facets")
+    for facet, column in FACET_COLUMNS.items():
+        op.execute(
+            "INSERT INTO job_facets (facet, value, count) "
+            f"SELECT '{facet}', {column}, COUNT(*) FROM jobs "
+            f"WHERE is_active AND {column} IS NOT NULL GROUP BY {column}"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_column('poster_occupation')
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Check that list endpoints issue the same number of queries for any page size
+
+Seeds a throwaway SQLite database migrated to head through the API, then
+requests each list endpoint with limit=1 and with a larger limit and counts
+the SQL statements behind each response. Exits non-zero if the counts
+differ, which is how an N+1 (a query per row) shows up.
+
+Usage: python query_counts.py [--verbose]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_directory = tempfile.mkdtemp(prefix="trumpet-counts-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/counts.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from app.core.database import count_queries, engine
+from app.core.http_cache import response_cache
+
+# Larger than every seeded list, so the big page holds every row
+PAGE_SIZE = 50
+SEED_USERS = ["alice", "bob", "carol", "dave", "erin"]
+
+def check(response):
+    assert response.status_code < 400, f"{response.request.method} {response.request.url}: {response.status_code} {response.text}"
+    return response
+
+def seed(client):
+    """Give every list endpoint several rows, mostly from different users."""
+    tokens, ids = {}, {}
+    for name in SEED_USERS:
+        user = check(client.post("/api/auth/register", json={
+            "email": f"{name}@example.com", "username": name, "password": "password123",
+            "first_name": name.title(), "last_name": "Tester", "occupation": "nurse",
+            "interests": ["music", "tech"], "location": "Lagos"
+        })).json()
+        ids[name] = user["id"]
+        login = check(client.post("/api/auth/login", data={"username": f"{name}@example.com", "password": "password123"}))
+        tokens[name] = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    alice, others = tokens["alice"], [name for name in SEED_USERS if name != "alice"]
+
+    own_post = check(client.post("/api/posts/", json={"content": "Alice's post"}, headers=alice)).json()
+    for name in others:
+        headers = tokens[name]
+        post = check(client.post("/api/posts/", json={"content": f"{name}'s post"}, headers=headers)).json()
+        check(client.post(f"/api/posts/{post['id']}/like", headers=alice))
+        check(client.post(f"/api/posts/{post['id']}/comments", json={"content": "Nice"}, headers=alice))
+        check(client.post(f"/api/posts/{own_post['id']}/comments", json={"content": "Hi"}, headers=headers))
+
+        event = check(client.post("/api/events/", json={
+            "title": f"{name.title()}'s meetup", "description": "Monthly meetup", "location": "Lagos",
+            "date": (datetime.now() + timedelta(days=7)).isoformat(), "max_attendees": 10
+        }, headers=headers)).json()
+        check(client.post(f"/api/events/{event['id']}/attend", json={"status": "attending"}, headers=alice))
+
+        check(client.post("/api/jobs/", json={
+            "title": "Ward nurse", "description": "Night shifts", "company": f"{name.title()} Hospital",
+            "location": "Lagos", "type": "full-time", "requirements": ["RN licence"], "benefits": ["Pension"]
+        }, headers=headers))
+
+        for content in ("Hi Alice", "Are you there?"):
+            check(client.post("/api/messages/", json={"receiver_id": ids["alice"], "content": content}, headers=headers))
+        check(client.post("/api/messages/", json={"receiver_id": ids[name], "content": "Hello"}, headers=alice))
+
+    # Let the background tasks and the notification writer catch up
+    time.sleep(1)
+    return tokens, ids
+
+def list_endpoints(ids):
+    return [
+        "/api/posts/",
+        "/api/posts/timeline",
+        "/api/events/",
+        "/api/jobs/",
+        "/api/jobs/search?q=nurse",
+        "/api/messages/conversations",
+        f"/api/messages/{ids['bob']}",
+        "/api/users/",
+        "/api/users/search/tester",
+        f"/api/users/{ids['alice']}/matches",
+        "/api/notifications/",
+    ]
+
+def rows_in(body):
+    # /api/jobs/search wraps its page in an envelope
+    return len(body["jobs"] if isinstance(body, dict) else body)
+
+def count(client, url, headers):
+    """Statements behind one uncached request, and the rows it returned."""
+    response_cache.clear()
+    with count_queries() as counter:
+        response = check(client.get(url, headers=headers))
+    return counter["count"], rows_in(response.json())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail when list endpoints issue more queries for bigger pages")
+    parser.add_argument("--verbose", action="store_true", help="Print every count")
+    args = parser.parse_args()
+
+    command.upgrade(Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")), "head")
+
+    from app.main import app
+    failures = 0
+    with TestClient(app) as client:
+        tokens, ids = seed(client)
+        alice = tokens["alice"]
+        # Fill the per-process caches (token, interest index) before counting
+        for endpoint in list_endpoints(ids):
+            separator = "&" if "?" in endpoint else "?"
+            check(client.get(f"{endpoint}{separator}limit=2", headers=alice))
+
+        for endpoint in list_endpoints(ids):
+            separator = "&" if "?" in endpoint else "?"
+            small, small_rows = count(client, f"{endpoint}{separator}limit=1", alice)
+            large, large_rows = count(client, f"{endpoint}{separator}limit={PAGE_SIZE}", alice)
+            if large_rows <= small_rows:
+                print(f"❌ {endpoint}: limit={PAGE_SIZE} returned {large_rows} rows; seed more data")
+                failures += 1
+            elif small != large:
+                print(f"❌ {endpoint}: {small} queries for {small_rows} row, {large} for {large_rows} rows")
+                failures += 1
+            elif args.verbose:
+                print(f"✅ {endpoint}: {small} queries for {small_rows} row and for {large_rows} rows")
+
+    engine.dispose()
+    shutil.rmtree(_directory, ignore_errors=True)
+
+    checked = len(list_endpoints(ids))
+    print(f"{'❌' if failures else '✅'} {checked} list endpoints checked, {failures} with page-size dependent queries")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Check the query plans behind the API endpoints for full table scans
+
+Runs a scripted round of requests against a throwaway SQLite database migrated
+to head, records every statement the endpoints issue and runs EXPLAIN QUERY
+PLAN on each. Exits non-zero if any table is scanned without an index, or
+if any request returns an error status.
+
+Usage: python query_plans.py [--verbose]
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Plans are checked against SQLite; SQLite without ANALYZE statistics assumes
+# every table is large, so the plans do not depend on how much data exists
+_directory = tempfile.mkdtemp(prefix="trumpet-plans-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/plans.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import Base, engine
+
+# "SCAN posts" or "SCAN p" (an alias); "USING INDEX" / "USING COVERING INDEX" are fine
+SCAN = re.compile(r"^SCAN (\w+)(.*)$")
+CHECKED_STATEMENTS = ("SELECT", "UPDATE", "DELETE", "INSERT INTO timeline_entries")
+
+# Statements that read a whole table on purpose
+INTENDED_FULL_READS = {
+    # InterestIndex loads every (user, interest) pair into its bitmaps
+    "user_interests": re.compile(r"^SELECT user_interests\.user_id AS \w+, user_interests\.interest AS \w+ FROM user_interests$"),
+}
+
+def check(response):
+    """Fail on an error response rather than silently missing the plans behind it."""
+    assert response.status_code < 400, f"{response.request.method} {response.request.url}: {response.status_code} {response.text}"
+    return response
+
+def exercise_endpoints(client):
+    """Hit every endpoint once with the filters the frontend uses."""
+    tokens, ids = [], []
+    for name, occupation in [("alice", "nurse"), ("bob", "nurse")]:
+        user = check(client.post("/api/auth/register", json={
+            "email": f"{name}@example.com", "username": name, "password": "password123",
+            "first_name": name.title(), "last_name": "Tester", "occupation": occupation,
+            "interests": ["music", "tech"], "location": "Lagos"
+        })).json()
+        ids.append(user["id"])
+        login = check(client.post("/api/auth/login", data={"username": f"{name}@example.com", "password": "password123"}))
+        tokens.append({"Authorization": f"Bearer {login.json()['access_token']}"})
+    alice, bob = tokens
+
+    check(client.get("/api/auth/me", headers=alice))
+    check(client.put("/api/auth/profile", json={"bio": "Hello", "interests": ["music"]}, headers=alice))
+
+    post = check(client.post("/api/posts/", json={"content": "First post"}, headers=alice)).json()
+    check(client.post(f"/api/posts/{post['id']}/like", headers=bob))
+    check(client.post(f"/api/posts/{post['id']}/comments", json={"content": "Nice"}, headers=bob))
+    check(client.get("/api/posts/", headers=alice))
+    check(client.get("/api/posts/?occupation=nurse&location=Lag", headers=alice))
+    page = check(client.get("/api/posts/?limit=1", headers=alice))
+    if page.headers.get("X-Next-Cursor"):
+        check(client.get(f"/api/posts/?limit=1&cursor={page.headers['X-Next-Cursor']}", headers=alice))
+    check(client.get("/api/posts/timeline", headers=alice))
+    check(client.get(f"/api/posts/{post['id']}", headers=alice))
+
+    new_event = check(client.post("/api/events/", json={
+        "title": "Meetup", "description": "Monthly meetup", "location": "Lagos",
+        "date": (datetime.now() + timedelta(days=7)).isoformat(), "max_attendees": 1
+    }, headers=alice)).json()
+    check(client.post(f"/api/events/{new_event['id']}/attend", json={"status": "attending"}, headers=bob))
+    # Full: alice is waitlisted, then promoted when bob drops out
+    check(client.post(f"/api/events/{new_event['id']}/attend", json={"status": "attending"}, headers=alice))
+    check(client.post(f"/api/events/{new_event['id']}/attend", json={"status": "not_attending"}, headers=bob))
+    check(client.get("/api/events/", headers=alice))
+    check(client.get("/api/events/?occupation=nurse&location=Lag", headers=alice))
+    check(client.get("/api/events/?near=6.52,3.38&radius_km=25", headers=alice))
+    check(client.get(f"/api/events/{new_event['id']}", headers=alice))
+
+    job = check(client.post("/api/jobs/", json={
+        "title": "Ward nurse", "description": "Night shifts", "company": "General Hospital",
+        "location": "Lagos", "type": "full-time", "requirements": ["RN licence"], "benefits": ["Pension"]
+    }, headers=alice)).json()
+    check(client.post(f"/api/jobs/{job['id']}/apply", json={"cover_letter": "Hi"}, headers=bob))
+    check(client.get("/api/jobs/", headers=alice))
+    check(client.get("/api/jobs/?type=full-time&occupation=nurse&location=Lag", headers=alice))
+    check(client.get("/api/jobs/?near=6.52,3.38&radius_km=25", headers=alice))
+    check(client.get("/api/jobs/search?q=nurse", headers=alice))
+    check(client.get("/api/jobs/search?q=night shi&type=full-time&occupation=nurse", headers=alice))
+    check(client.put(f"/api/jobs/{job['id']}/active", json={"is_active": False}, headers=alice))
+    check(client.put(f"/api/jobs/{job['id']}/active", json={"is_active": True}, headers=alice))
+    check(client.get(f"/api/jobs/{job['id']}", headers=alice))
+
+    check(client.post("/api/messages/", json={"receiver_id": ids[0], "content": "Hi Alice"}, headers=bob))
+    check(client.get("/api/messages/conversations", headers=alice))
+    thread = check(client.get(f"/api/messages/{ids[1]}?limit=1", headers=alice))
+    check(client.get(f"/api/messages/{ids[1]}?after={thread.headers['X-After-Cursor']}", headers=alice))
+    check(client.get(f"/api/messages/{ids[1]}?before={thread.headers['X-After-Cursor']}", headers=alice))
+    check(client.post(f"/api/messages/{ids[1]}/read", json={}, headers=alice))
+
+    check(client.get("/api/users/", headers=alice))
+    check(client.get("/api/users/?occupation=nurse&interests=music,tech&match=all", headers=alice))
+    check(client.get("/api/users/?interests=music&match=any", headers=alice))
+    check(client.get("/api/users/?near=6.52,3.38&radius_km=25", headers=alice))
+    check(client.get(f"/api/users/{ids[1]}", headers=alice))
+    check(client.get(f"/api/users/{ids[0]}/matches", headers=alice))
+    check(client.get("/api/users/search/bo", headers=alice))
+
+    # Let the background tasks and the notification writer catch up
+    time.sleep(1)
+    notifications = check(client.get("/api/notifications/", headers=alice)).json()
+    check(client.get("/api/notifications/?unread_only=true", headers=alice))
+    if notifications:
+        check(client.put(f"/api/notifications/{notifications[0]['id']}/read", headers=alice))
+        check(client.delete(f"/api/notifications/{notifications[0]['id']}", headers=alice))
+    check(client.put("/api/notifications/read-all", headers=alice))
+
+def full_scans(connection, statement, parameters, aliases):
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    details = [row[-1] for row in rows]
+    scans = []
+    for detail in details:
+        match = SCAN.match(detail)
+        if match and "USING" not in match.group(2):
+            table = aliases.get(match.group(1), match.group(1))
+            intended = INTENDED_FULL_READS.get(table)
+            if table in Base.metadata.tables and not (intended and intended.match(" ".join(statement.split()))):
+                scans.append(detail)
+    return details, scans
+
+def table_aliases(statement):
+    """Map "FROM posts AS p"-style aliases back to table names."""
+    return {alias: table for table, alias in re.findall(r"\b(\w+) AS (\w+)\b", statement)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail on full table scans behind the API endpoints")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    command.upgrade(Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")), "head")
+
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(CHECKED_STATEMENTS):
+            statements.setdefault(statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", record)
+    from app.main import app
+    with TestClient(app) as client:
+        exercise_endpoints(client)
+    event.remove(engine, "before_cursor_execute", record)
+
+    failures = 0
+    with engine.connect() as connection:
+        for statement, parameters in statements.items():
+            details, scans = full_scans(connection, statement, parameters, table_aliases(statement))
+            if args.verbose or scans:
+                print(("❌ " if scans else "✅ ") + " ".join(statement.split())[:200])
+                for detail in details:
+                    print(f"     {detail}")
+            failures += bool(scans)
+
+    engine.dispose()
+    shutil.rmtree(_directory, ignore_errors=True)
+
+    print(f"{'❌' if failures else '✅'} {len(statements)} statements checked, {failures} with full table scans")
+    sys.exit(1 if failures else 0)
@@ -24,6 +24,17 @@ def install_requirements():
             print(f"❌ Failed to install dependencies: {e}")
             return False
 
+def migrate_database():
+    """Apply database migrations"""
+    print("🗄️  Applying database migrations...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "alembic", "upgrade", "head"])
+        print("✅ Database schema up to date")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to migrate database: {e}")
+        return False
+
 def seed_database():
     """Seed the database"""
     print("🌱 Seeding database...")
@@ -55,6 +66,9 @@ if __name__ == "__main__":
     if not install_requirements():
         sys.exit(1)
     
+    if not migrate_database():
+        sys.exit(1)
+    
     if not seed_database():
         print("⚠️  Continuing without seeding...")
     
@@ -2,24 +2,23 @@
 """
 Database seeding script for Trumpet API
 """
-import json
 import uuid
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 
-from app.core.database import SessionLocal, engine
+from app.core.database import SessionLocal
 from app.core.config import settings
 from app.models.user import User
 from app.models.post import Post
 from app.models.event import Event
 from app.models.job import Job
+from app.services.auth import get_password_hash
+from app.services.geo import set_location
+from app.services.interests import set_user_interests
+from app.services.job_facets import adjust_job_facets
+from app.services.search import index_job, index_user
 
-# Create tables
-from app.models import *
-Base.metadata.create_all(bind=engine)
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Tables come from the migrations: run `alembic upgrade head` first
 
 def seed_database():
     db = SessionLocal()
@@ -81,9 +80,9 @@ def seed_database():
                 username=user_data["username"],
                 first_name=user_data["first_name"],
                 last_name=user_data["last_name"],
-                password_hash=pwd_context.hash("password123"),
+                password_hash=get_password_hash("password123"),
                 occupation=user_data["occupation"],
-                interests=json.dumps(user_data["interests"]),
+                interests=user_data["interests"],
                 location=user_data["location"],
                 bio=user_data["bio"],
                 is_verified=user_data["is_verified"],
@@ -91,9 +90,14 @@ def seed_database():
                 level=user_data["level"],
                 experience=user_data["experience"]
             )
+            set_location(db, user)
             db.add(user)
             users.append(user)
         
+        db.flush()
+        for user, user_data in zip(users, users_data):
+            set_user_interests(db, user.id, user_data["interests"])
+            index_user(db, user)
         db.commit()
         print(f"✅ Created {len(users)} users")
         
@@ -157,6 +161,7 @@ def seed_database():
                 max_attendees=event_data["max_attendees"],
                 organizer_id=event_data["organizer_id"]
             )
+            set_location(db, event)
             db.add(event)
             events.append(event)
         
@@ -189,6 +194,7 @@ def seed_database():
             }
         ]
         
+        posters = {user.id: user for user in users}
         jobs = []
         for job_data in jobs_data:
             job = Job(
@@ -199,13 +205,20 @@ def seed_database():
                 location=job_data["location"],
                 type=job_data["type"],
                 salary=job_data["salary"],
-                requirements=json.dumps(job_data["requirements"]),
-                benefits=json.dumps(job_data["benefits"]),
-                poster_id=job_data["poster_id"]
+                requirements=job_data["requirements"],
+                benefits=job_data["benefits"],
+                poster_id=job_data["poster_id"],
+                poster_occupation=posters[job_data["poster_id"]].occupation
             )
+            set_location(db, job)
             db.add(job)
             jobs.append(job)
         
+        # As create_job does: search entries and facet counts
+        db.flush()
+        for job in jobs:
+            index_job(db, job)
+            adjust_job_facets(db, job, 1)
         db.commit()
         print(f"✅ Created {len(jobs)} jobs")
         
@@ -14,6 +14,9 @@ source venv/bin/activate
 echo "📦 Installing dependencies..."
 pip install -r requirements.txt
 
+echo "🗄️  Applying database migrations..."
+alembic upgrade head
+
 echo "🌱 Seeding database..."
 python seed_db.py
 